@@ -1,11 +1,31 @@
 import sqlite3
 import os
+import json
 
 DATABASE_PATH = os.path.join(os.path.dirname(__file__), 'data', 'plexscanner.db')
+# Where the ignore list lived before migrate_007_ignored_shows moved it into the database
+LEGACY_IGNORE_PATH = os.path.join(os.path.dirname(__file__), 'ignore.json')
 
-def init_db():
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
+def connect(path=DATABASE_PATH):
+    """Open a connection with the per-connection pragmas the app relies on"""
+    # Scans write from several threads, so wait for the write lock instead of failing fast
+    conn = sqlite3.connect(path, timeout=30)
+    # Safe with WAL: a crash can lose the last commits but never corrupts the database
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute('PRAGMA cache_size=-65536')  # 64 MiB
+    conn.execute('PRAGMA mmap_size=268435456')  # 256 MiB
+    conn.execute('PRAGMA temp_store=MEMORY')
+    return conn
+
+def add_column_if_missing(cursor, table, column, column_type):
+    cursor.execute(f"PRAGMA table_info({table})")
+    columns = [column_info[1] for column_info in cursor.fetchall()]
+    if column not in columns:
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+
+def migrate_001_initial_schema(cursor):
+    # Databases created before migrations were versioned may already have some
+    # or all of this, so everything here has to be idempotent.
 
     # Create TV Shows table
     cursor.execute('''
@@ -41,11 +61,12 @@ def init_db():
         )
     ''')
 
-    # Add collection_tmdb_id to movies table if it doesn't exist
-    cursor.execute("PRAGMA table_info(movies)")
-    columns = [column[1] for column in cursor.fetchall()]
-    if 'collection_tmdb_id' not in columns:
-        cursor.execute("ALTER TABLE movies ADD COLUMN collection_tmdb_id TEXT")
+    # Columns added to existing tables over time
+    add_column_if_missing(cursor, 'movies', 'collection_tmdb_id', 'TEXT')
+    add_column_if_missing(cursor, 'tv_shows', 'plex_updated_at', 'INTEGER')
+    add_column_if_missing(cursor, 'tv_shows', 'plex_leaf_count', 'INTEGER')
+    add_column_if_missing(cursor, 'tv_shows', 'tmdb_last_air_date', 'TEXT')
+    add_column_if_missing(cursor, 'tv_shows', 'tmdb_next_episode_air_date', 'TEXT')
 
     # Create Seasons table
     cursor.execute('''
@@ -104,7 +125,177 @@ def init_db():
         )
     ''')
 
-    conn.commit()
+    # Create App State table (small key/value store, e.g. when the last scan ran)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS app_state (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        )
+    ''')
+
+def migrate_002_lookup_indexes(cursor):
+    # UNIQUE constraints already index tv_shows.title, movies.tmdb_id, collections.tmdb_id,
+    # seasons (tv_show_id, season_number), episodes (season_id, episode_number)
+    # and missing_movies (collection_id, tmdb_id)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_tv_shows_tmdb_id ON tv_shows (tmdb_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_movies_collection_tmdb_id ON movies (collection_tmdb_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_movies_title ON movies (title)")
+
+def migrate_003_library_api_indexes(cursor):
+    # Genres and networks as rows so the library API can filter on them with an index
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS show_genres (
+            tv_show_id INTEGER NOT NULL,
+            genre TEXT NOT NULL,
+            FOREIGN KEY (tv_show_id) REFERENCES tv_shows(id),
+            PRIMARY KEY (genre, tv_show_id)
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS show_networks (
+            tv_show_id INTEGER NOT NULL,
+            network TEXT NOT NULL,
+            FOREIGN KEY (tv_show_id) REFERENCES tv_shows(id),
+            PRIMARY KEY (network, tv_show_id)
+        )
+    ''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_show_genres_tv_show_id ON show_genres (tv_show_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_show_networks_tv_show_id ON show_networks (tv_show_id)")
+    for row in cursor.execute("SELECT id, genres, networks FROM tv_shows").fetchall():
+        cursor.executemany("INSERT OR IGNORE INTO show_genres (tv_show_id, genre) VALUES (?, ?)", [(row[0], genre) for genre in json.loads(row[1] or '[]')])
+        cursor.executemany("INSERT OR IGNORE INTO show_networks (tv_show_id, network) VALUES (?, ?)", [(row[0], network) for network in json.loads(row[2] or '[]')])
+
+    # Keyset pagination indexes; the expressions must match SHOW_SORTS/MOVIE_SORTS in main.py
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_tv_shows_status_title ON tv_shows (status, title)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_tv_shows_series_status_title ON tv_shows (series_status, title)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_tv_shows_vote_average ON tv_shows (IFNULL(vote_average, 0), id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_tv_shows_last_updated ON tv_shows (IFNULL(last_updated, ''), id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_tv_shows_first_air_date ON tv_shows (IFNULL(first_air_date, ''), id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_collections_name ON collections (name, id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_movies_release_date ON movies (IFNULL(release_date, ''), id)")
+
+def migrate_004_scan_jobs(cursor):
+    # Persisted scan jobs; checkpoints hold the items a running job has finished so it can resume
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS scan_jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind TEXT NOT NULL,
+            mode TEXT NOT NULL,
+            state TEXT NOT NULL,
+            trigger TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            started_at TEXT,
+            finished_at TEXT,
+            processed INTEGER NOT NULL DEFAULT 0,
+            total INTEGER NOT NULL DEFAULT 0,
+            error TEXT
+        )
+    ''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_scan_jobs_kind_state ON scan_jobs (kind, state, id)")
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS scan_job_checkpoints (
+            job_id INTEGER NOT NULL,
+            item TEXT NOT NULL,
+            FOREIGN KEY (job_id) REFERENCES scan_jobs(id),
+            PRIMARY KEY (job_id, item)
+        )
+    ''')
+
+def migrate_005_plex_movie_ids(cursor):
+    # Plex ratingKey -> TMDb id as resolved by the movie scan. A NULL tmdb_id records a title search
+    # that found nothing; rows are only trusted while plex_updated_at still matches the item.
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS plex_movie_ids (
+            rating_key TEXT PRIMARY KEY,
+            tmdb_id TEXT,
+            title TEXT,
+            plex_updated_at INTEGER,
+            source TEXT NOT NULL,
+            resolved_at TEXT NOT NULL
+        )
+    ''')
+
+def migrate_006_episode_counts(cursor):
+    # Missing (aired, not in Plex) and upcoming episode counts, classified once per show by the scan
+    add_column_if_missing(cursor, 'tv_shows', 'missing_count', 'INTEGER NOT NULL DEFAULT 0')
+    add_column_if_missing(cursor, 'tv_shows', 'future_count', 'INTEGER NOT NULL DEFAULT 0')
+    # ISO dates compare correctly as strings; episodes without an air date count as aired
+    cursor.execute('''
+        UPDATE tv_shows SET
+            missing_count = (SELECT COUNT(*) FROM episodes e JOIN seasons s ON s.id = e.season_id
+                             WHERE s.tv_show_id = tv_shows.id AND NOT e.exists_in_plex AND IFNULL(e.air_date, '') < date('now', 'localtime')),
+            future_count = (SELECT COUNT(*) FROM episodes e JOIN seasons s ON s.id = e.season_id
+                            WHERE s.tv_show_id = tv_shows.id AND NOT e.exists_in_plex AND IFNULL(e.air_date, '') >= date('now', 'localtime'))
+    ''')
+
+def migrate_007_ignored_shows(cursor):
+    # Ignored shows keyed by title and, when the show has been scanned, TMDb id, so a show
+    # Plex renames stays ignored. Pages leave them out with an anti-join on both columns.
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS ignored_shows (
+            title TEXT PRIMARY KEY,
+            tmdb_id TEXT,
+            ignored_at TEXT NOT NULL
+        )
+    ''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_ignored_shows_tmdb_id ON ignored_shows (tmdb_id)")
+    titles = []
+    if os.path.exists(LEGACY_IGNORE_PATH):
+        try:
+            with open(LEGACY_IGNORE_PATH, 'r') as f:
+                titles = json.loads(f.read() or '[]')
+        except json.JSONDecodeError:
+            pass
+    cursor.executemany('''
+        INSERT OR IGNORE INTO ignored_shows (title, tmdb_id, ignored_at)
+        VALUES (?, (SELECT tmdb_id FROM tv_shows WHERE title = ?), datetime('now', 'localtime'))
+    ''', [(title, title) for title in titles])
+
+def migrate_008_plex_tv_items(cursor):
+    # Plex rating keys of every show, season and episode a scan has seen, so Plex notifications
+    # (including deletions, whose items Plex can no longer return) map to a show without a lookup.
+    # Filled in by the next scan of each show.
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS plex_tv_items (
+            rating_key TEXT PRIMARY KEY,
+            tv_show_id INTEGER NOT NULL,
+            FOREIGN KEY (tv_show_id) REFERENCES tv_shows(id)
+        )
+    ''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_plex_tv_items_tv_show_id ON plex_tv_items (tv_show_id)")
+
+# Applied in order; PRAGMA user_version records how many have run.
+# Never edit a migration that has shipped, append a new one instead.
+MIGRATIONS = [
+    migrate_001_initial_schema,
+    migrate_002_lookup_indexes,
+    migrate_003_library_api_indexes,
+    migrate_004_scan_jobs,
+    migrate_005_plex_movie_ids,
+    migrate_006_episode_counts,
+    migrate_007_ignored_shows,
+    migrate_008_plex_tv_items,
+]
+
+def init_db():
+    conn = connect()
+    # WAL lets pages read while a scan writes; the mode is persisted in the database file
+    conn.execute('PRAGMA journal_mode=WAL')
+    # Manage transactions ourselves so each migration and its version bump commit together
+    conn.isolation_level = None
+    cursor = conn.cursor()
+
+    version = cursor.execute('PRAGMA user_version').fetchone()[0]
+    for number, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+        cursor.execute('BEGIN')
+        try:
+            migration(cursor)
+            cursor.execute(f'PRAGMA user_version = {number}')
+            cursor.execute('COMMIT')
+        except Exception:
+            cursor.execute('ROLLBACK')
+            raise
+
     conn.close()
 
 if __name__ == '__main__':
@@ -0,0 +1,69 @@
+import json
+import queue
+import threading
+
+
+class EventBroker:
+    """In-process publish/subscribe fan-out for Server-Sent Events.
+
+    Every subscriber gets its own bounded queue. A subscriber that falls
+    behind has its backlog replaced by a single 'resync' event, so a stalled
+    browser tab can't grow memory or hold up publishers.
+    """
+
+    def __init__(self, max_queue=256, keepalive=15):
+        self.max_queue = max_queue
+        self.keepalive = keepalive
+        self._lock = threading.Lock()
+        self._channels = {}
+        self._subscribed = threading.Condition(self._lock)
+
+    def subscribe(self, channel):
+        q = queue.Queue(self.max_queue)
+        with self._lock:
+            self._channels.setdefault(channel, set()).add(q)
+            self._subscribed.notify_all()
+        return q
+
+    def unsubscribe(self, channel, q):
+        with self._lock:
+            self._channels.get(channel, set()).discard(q)
+
+    def subscribers(self, channel):
+        with self._lock:
+            return len(self._channels.get(channel, ()))
+
+    def wait_for_subscriber(self, channel, timeout):
+        """Block until channel has a subscriber or timeout passes; returns whether it has one"""
+        with self._lock:
+            return self._subscribed.wait_for(lambda: self._channels.get(channel), timeout)
+
+    def publish(self, channel, event, data):
+        message = format_event(event, data)
+        with self._lock:
+            subscribers = list(self._channels.get(channel, ()))
+        for q in subscribers:
+            try:
+                q.put_nowait(message)
+            except queue.Full:
+                with q.mutex:
+                    q.queue.clear()
+                q.put_nowait(format_event('resync', {}))
+
+    def stream(self, channel, q, initial=()):
+        """Generator of SSE frames for a subscriber queue; unsubscribes when the client goes away"""
+        try:
+            for event, data in initial:
+                yield format_event(event, data)
+            while True:
+                try:
+                    yield q.get(timeout=self.keepalive)
+                except queue.Empty:
+                    # Comment line: keeps proxies from timing out and surfaces closed connections
+                    yield ': keepalive\n\n'
+        finally:
+            self.unsubscribe(channel, q)
+
+
+def format_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
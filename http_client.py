@@ -0,0 +1,142 @@
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# (connect, read) timeouts in seconds per upstream
+DEFAULT_TIMEOUTS = {
+    'tmdb': (5, 15),
+    'prowlarr': (5, 60),
+    'plex': (5, 30),
+    'qbittorrent': (5, 15),
+    'torrent': (5, 30)
+}
+
+# Upper bounds in seconds of the latency histogram buckets; the last one catches everything slower
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, float('inf'))
+
+# 429 is left out on purpose: TMDb rate limiting is handled by the token bucket in main.py
+RETRY_STATUSES = (500, 502, 503, 504)
+
+
+class JitteredRetry(Retry):
+    """urllib3 Retry with full jitter, so concurrent scan workers don't retry in lockstep"""
+
+    def get_backoff_time(self):
+        return random.uniform(0, super().get_backoff_time())
+
+
+class LatencyHistogram:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds, error=False):
+        with self._lock:
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if seconds <= bound:
+                    self.buckets[i] += 1
+                    break
+            self.count += 1
+            self.total += seconds
+            self.max = max(self.max, seconds)
+            if error:
+                self.errors += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'count': self.count,
+                'errors': self.errors,
+                'avg_seconds': self.total / self.count if self.count else 0.0,
+                'max_seconds': self.max,
+                'buckets': [{'le': '+Inf' if bound == float('inf') else bound, 'count': n} for bound, n in zip(LATENCY_BUCKETS, self.buckets)]
+            }
+
+
+class ServiceSession(requests.Session):
+    """Keep-alive session for one upstream: pooled connections, default timeout, retries and latency tracking"""
+
+    def __init__(self, service, histogram, timeout, pool_size, retries, backoff_factor):
+        super().__init__()
+        self.service = service
+        self.histogram = histogram
+        self.timeout = timeout
+        # Only idempotent methods are retried (urllib3's default allowed_methods)
+        retry = JitteredRetry(total=retries, connect=retries, read=retries, status=retries,
+                              status_forcelist=RETRY_STATUSES, backoff_factor=backoff_factor,
+                              respect_retry_after_header=True, raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.mount('http://', adapter)
+        self.mount('https://', adapter)
+
+    def request(self, method, url, **kwargs):
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout
+        start = time.monotonic()
+        try:
+            response = super().request(method, url, **kwargs)
+        except requests.exceptions.RequestException:
+            self.histogram.observe(time.monotonic() - start, error=True)
+            raise
+        self.histogram.observe(time.monotonic() - start, error=response.status_code >= 500)
+        return response
+
+
+class HTTPClients:
+    """One shared ServiceSession per upstream service, created on first use"""
+
+    def __init__(self, timeouts=None, pool_size=10, retries=3, backoff_factor=0.5):
+        self.timeouts = dict(DEFAULT_TIMEOUTS)
+        for service, timeout in (timeouts or {}).items():
+            self.timeouts[service] = tuple(timeout) if isinstance(timeout, (list, tuple)) else timeout
+        self.pool_size = pool_size
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self._lock = threading.Lock()
+        self._sessions = {}
+        self._histograms = {}
+
+    def histogram(self, service):
+        with self._lock:
+            if service not in self._histograms:
+                self._histograms[service] = LatencyHistogram()
+            return self._histograms[service]
+
+    def session(self, service):
+        with self._lock:
+            session = self._sessions.get(service)
+        if session is None:
+            session = ServiceSession(service, self.histogram(service), self.timeout(service),
+                                     self.pool_size, self.retries, self.backoff_factor)
+            with self._lock:
+                session = self._sessions.setdefault(service, session)
+        return session
+
+    def timeout(self, service):
+        return self.timeouts.get(service, (5, 30))
+
+    @contextmanager
+    def timer(self, service):
+        """Record latency for calls made through a client library with its own session (e.g. qBittorrent)"""
+        histogram = self.histogram(service)
+        start = time.monotonic()
+        try:
+            yield
+        except Exception:
+            histogram.observe(time.monotonic() - start, error=True)
+            raise
+        histogram.observe(time.monotonic() - start)
+
+    def get_stats(self):
+        with self._lock:
+            histograms = dict(self._histograms)
+        return {service: histogram.snapshot() for service, histogram in histograms.items()}
@@ -1,18 +1,29 @@
-from flask import Flask, render_template, request, jsonify, redirect, url_for
+from flask import Flask, render_template, request, jsonify, redirect, url_for, Response, stream_with_context
 from plexapi.server import PlexServer
+from plexapi.exceptions import NotFound
 import requests
 import os
 import json
+import base64
+import gzip
+import hashlib
 from datetime import datetime
 import time
 import threading
-import random
-from urllib.parse import unquote
-from database import init_db, DATABASE_PATH
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from functools import wraps
+from collections import deque
+from urllib.parse import unquote, urlencode
+from database import init_db, connect, DATABASE_PATH
+from tmdb_cache import TMDbCache
+from http_client import HTTPClients
+from events import EventBroker
+from response_cache import DataGeneration, ResponseCache, GZIP_MIN_SIZE
 import sqlite3
 import logging
 
 from qbittorrentapi import Client
+from qbittorrent_client import QBittorrent
 import re
 from apscheduler.schedulers.background import BackgroundScheduler
 
@@ -39,6 +50,37 @@ with open(CONFIG_PATH, 'r') as config_file:
 # Set paths
 # JSON_PATH = os.path.join(os.path.dirname(__file__), CONFIG['app']['scan_results_path'])
 
+# On-disk TMDb response cache (data/tmdb_cache.db)
+TMDB_CACHE_CONFIG = CONFIG.get('tmdb', {}).get('cache', {})
+TMDB_CACHE = TMDbCache(max_bytes=TMDB_CACHE_CONFIG.get('max_size_mb', 256) * 1024 * 1024)
+
+# Cache lifetimes in hours, by how likely the content is to change
+TMDB_CACHE_TTL_HOURS = {
+    'ended_series': 24 * 30,
+    'returning_series': 6,
+    'other_series': 24,
+    'past_season': 24 * 30,
+    'current_season': 6,
+    'movie': 24 * 7,
+    'collection': 24,
+    'search': 24,
+    'default': 24
+}
+TMDB_CACHE_TTL_HOURS.update(TMDB_CACHE_CONFIG.get('ttl_hours', {}))
+
+# Shared keep-alive sessions for outbound HTTP. The pool is sized so a TV and a
+# movie scan running side by side never wait for a free TMDb connection.
+HTTP_CONFIG = CONFIG.get('http', {})
+HTTP_CLIENTS = HTTPClients(
+    timeouts=HTTP_CONFIG.get('timeouts'),
+    pool_size=int(CONFIG.get('scan', {}).get('tv_workers', 4)) + int(CONFIG.get('scan', {}).get('movie_workers', 8)),
+    retries=HTTP_CONFIG.get('retries', 3),
+    backoff_factor=HTTP_CONFIG.get('backoff_factor', 0.5)
+)
+
+# Pub/sub channels behind the Server-Sent Event streams
+EVENTS = EventBroker()
+
 # Global variables for scan status
 SCAN_STATUS = {
     'in_progress': False,
@@ -49,9 +91,15 @@ SCAN_STATUS = {
     'status_message': '',
     'start_time': None,
     'stop_requested': False,
-    'partial_results': {}
+    'partial_results': {},
+    'http_requests': 0,
+    'last_show_http_requests': 0,
+    'mode': 'full'
 }
 
+# Scan workers update SCAN_STATUS concurrently
+SCAN_STATUS_LOCK = threading.Lock()
+
 MOVIE_SCAN_STATUS = {
     'in_progress': False,
     'progress': 0,
@@ -61,25 +109,250 @@ MOVIE_SCAN_STATUS = {
     'status_message': '',
     'start_time': None,
     'stop_requested': False,
+    'phase': '',
+    'phases': {}
 }
+MOVIE_SCAN_STATUS_LOCK = threading.Lock()
 
 # === DATABASE FUNCTIONS ===
 def get_db_connection():
-    conn = sqlite3.connect(DATABASE_PATH)
+    conn = connect()
     conn.row_factory = sqlite3.Row
     return conn
 
-def insert_tv_show(title, tmdb_id, poster_url, overview, first_air_date, status, series_status, number_of_seasons, number_of_episodes, genres, vote_average, networks):
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        INSERT OR REPLACE INTO tv_shows (title, tmdb_id, poster_url, overview, first_air_date, status, series_status, number_of_seasons, number_of_episodes, genres, vote_average, networks, last_updated)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """, (title, tmdb_id, poster_url, overview, first_air_date, status, series_status, number_of_seasons, number_of_episodes, json.dumps(genres), vote_average, json.dumps(networks), datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
-    conn.commit()
-    tv_show_id = cursor.lastrowid
-    conn.close()
-    return tv_show_id
+# Movie library upserts shared by the full movie scan and single collection rescans.
+# Rows are only rewritten when a column actually changed.
+MOVIE_UPSERT_SQL = """
+    INSERT INTO movies (title, tmdb_id, poster_url, overview, release_date, studio, collection_tmdb_id, last_updated)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(tmdb_id) DO UPDATE SET
+        title = excluded.title, poster_url = excluded.poster_url, overview = excluded.overview, release_date = excluded.release_date,
+        studio = excluded.studio, collection_tmdb_id = excluded.collection_tmdb_id, last_updated = excluded.last_updated
+    WHERE movies.title IS NOT excluded.title OR movies.poster_url IS NOT excluded.poster_url
+        OR movies.overview IS NOT excluded.overview OR movies.release_date IS NOT excluded.release_date
+        OR movies.studio IS NOT excluded.studio OR movies.collection_tmdb_id IS NOT excluded.collection_tmdb_id
+"""
+COLLECTION_UPSERT_SQL = """
+    INSERT INTO collections (name, tmdb_id, poster_url) VALUES (?, ?, ?)
+    ON CONFLICT(tmdb_id) DO UPDATE SET name = excluded.name, poster_url = excluded.poster_url
+    WHERE collections.name IS NOT excluded.name OR collections.poster_url IS NOT excluded.poster_url
+"""
+MISSING_MOVIE_UPSERT_SQL = """
+    INSERT INTO missing_movies (collection_id, title, tmdb_id, poster_url, release_date) VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT(collection_id, tmdb_id) DO UPDATE SET
+        title = excluded.title, poster_url = excluded.poster_url, release_date = excluded.release_date
+    WHERE missing_movies.title IS NOT excluded.title OR missing_movies.poster_url IS NOT excluded.poster_url
+        OR missing_movies.release_date IS NOT excluded.release_date
+"""
+
+class ScanWriter:
+    """Scan-scoped database writer.
+
+    Holds a single connection for the lifetime of a scan (or of one show),
+    writes seasons and episodes with executemany and only commits when asked
+    to or once commit_every rows are pending, instead of one connect/commit
+    cycle per row. Use as a context manager; it commits on a clean exit.
+    """
+
+    def __init__(self, commit_every=1000):
+        self.conn = get_db_connection()
+        self.commit_every = commit_every
+        self.pending = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.conn.rollback()
+        self.conn.close()
+
+    def _wrote(self, rows=1):
+        self.pending += rows
+        if self.pending >= self.commit_every:
+            self.commit()
+
+    def commit(self):
+        self.conn.commit()
+        self.pending = 0
+
+    def insert_tv_show(self, title, tmdb_id, poster_url, overview, first_air_date, status, series_status, number_of_seasons, number_of_episodes, genres, vote_average, networks, watermark=None,
+                       missing_count=0, future_count=0):
+        watermark = watermark or {}
+        # Upsert rather than REPLACE so the show keeps its id and its seasons stay attached.
+        # last_updated has microseconds because it doubles as the show details ETag.
+        self.conn.execute("""
+            INSERT INTO tv_shows (title, tmdb_id, poster_url, overview, first_air_date, status, series_status, number_of_seasons, number_of_episodes, genres, vote_average, networks, last_updated,
+                                  plex_updated_at, plex_leaf_count, tmdb_last_air_date, tmdb_next_episode_air_date, missing_count, future_count)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(title) DO UPDATE SET
+                tmdb_id = excluded.tmdb_id, poster_url = excluded.poster_url, overview = excluded.overview, first_air_date = excluded.first_air_date,
+                status = excluded.status, series_status = excluded.series_status, number_of_seasons = excluded.number_of_seasons,
+                number_of_episodes = excluded.number_of_episodes, genres = excluded.genres, vote_average = excluded.vote_average,
+                networks = excluded.networks, last_updated = excluded.last_updated, plex_updated_at = excluded.plex_updated_at,
+                plex_leaf_count = excluded.plex_leaf_count, tmdb_last_air_date = excluded.tmdb_last_air_date,
+                tmdb_next_episode_air_date = excluded.tmdb_next_episode_air_date, missing_count = excluded.missing_count, future_count = excluded.future_count
+        """, (title, tmdb_id, poster_url, overview, first_air_date, status, series_status, number_of_seasons, number_of_episodes, json.dumps(genres), vote_average, json.dumps(networks), datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f'),
+              watermark.get('plex_updated_at'), watermark.get('plex_leaf_count'), watermark.get('tmdb_last_air_date'), watermark.get('tmdb_next_episode_air_date'),
+              missing_count, future_count))
+        tv_show_id = self.conn.execute("SELECT id FROM tv_shows WHERE title = ?", (title,)).fetchone()['id']
+        # Keep the genre/network lookup tables the library API filters on in step
+        self.conn.execute("DELETE FROM show_genres WHERE tv_show_id = ?", (tv_show_id,))
+        self.conn.execute("DELETE FROM show_networks WHERE tv_show_id = ?", (tv_show_id,))
+        self.conn.executemany("INSERT OR IGNORE INTO show_genres (tv_show_id, genre) VALUES (?, ?)", [(tv_show_id, genre) for genre in genres or []])
+        self.conn.executemany("INSERT OR IGNORE INTO show_networks (tv_show_id, network) VALUES (?, ?)", [(tv_show_id, network) for network in networks or []])
+        self._wrote()
+        return tv_show_id
+
+    def insert_seasons(self, tv_show_id, seasons):
+        """Upsert (season_number, name, overview, poster_path, air_date) rows and return {season_number: season_id}"""
+        self.conn.executemany("""
+            INSERT INTO seasons (tv_show_id, season_number, name, overview, poster_path, air_date)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(tv_show_id, season_number) DO UPDATE SET
+                name = excluded.name, overview = excluded.overview, poster_path = excluded.poster_path, air_date = excluded.air_date
+        """, [(tv_show_id,) + tuple(season) for season in seasons])
+        self._wrote(len(seasons))
+        rows = self.conn.execute("SELECT id, season_number FROM seasons WHERE tv_show_id = ?", (tv_show_id,)).fetchall()
+        return {row['season_number']: row['id'] for row in rows}
+
+    def insert_episodes(self, episodes):
+        """Upsert (season_id, episode_number, name, air_date, overview, still_path, exists_in_plex, resolution, file_path) rows"""
+        self.conn.executemany("""
+            INSERT INTO episodes (season_id, episode_number, name, air_date, overview, still_path, exists_in_plex, resolution, file_path)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(season_id, episode_number) DO UPDATE SET
+                name = excluded.name, air_date = excluded.air_date, overview = excluded.overview, still_path = excluded.still_path,
+                exists_in_plex = excluded.exists_in_plex, resolution = excluded.resolution, file_path = excluded.file_path
+        """, episodes)
+        self._wrote(len(episodes))
+
+    def save_plex_tv_items(self, tv_show_id, rating_keys):
+        """Replace the Plex rating keys (show, seasons, episodes) recorded for a show"""
+        self.conn.execute("DELETE FROM plex_tv_items WHERE tv_show_id = ?", (tv_show_id,))
+        self.conn.executemany("INSERT OR REPLACE INTO plex_tv_items (rating_key, tv_show_id) VALUES (?, ?)",
+                              [(str(rating_key), tv_show_id) for rating_key in rating_keys if rating_key])
+        self._wrote(len(rating_keys))
+
+    def insert_movie(self, title, tmdb_id, poster_url, overview, release_date, studio, collection_tmdb_id):
+        # Upsert: keeps the row id and leaves an unchanged row alone
+        self.conn.execute(MOVIE_UPSERT_SQL, (title, tmdb_id, poster_url, overview, release_date, studio, collection_tmdb_id,
+                                             datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+        self._wrote()
+        return self.conn.execute("SELECT id FROM movies WHERE tmdb_id = ?", (tmdb_id,)).fetchone()['id']
+
+    def insert_collection(self, name, tmdb_id, poster_url):
+        self.conn.execute("INSERT OR IGNORE INTO collections (name, tmdb_id, poster_url) VALUES (?, ?, ?)", (name, tmdb_id, poster_url))
+        self._wrote()
+        return self.conn.execute("SELECT id FROM collections WHERE tmdb_id = ?", (tmdb_id,)).fetchone()['id']
+
+    def insert_missing_movies(self, missing_movies):
+        """Insert (collection_id, title, tmdb_id, poster_url, release_date) rows"""
+        self.conn.executemany("INSERT OR IGNORE INTO missing_movies (collection_id, title, tmdb_id, poster_url, release_date) VALUES (?, ?, ?, ?, ?)", missing_movies)
+        self._wrote(len(missing_movies))
+
+    def sync_movie_library(self, movies, collections, missing_movies, keep_movies=(), keep_collections=()):
+        """Swap a complete movie scan result in with one short transaction.
+
+        movies are (title, tmdb_id, poster_url, overview, release_date, studio, collection_tmdb_id),
+        collections are (name, tmdb_id, poster_url) and missing_movies are
+        (collection_tmdb_id, title, tmdb_id, poster_url, release_date). Rows that
+        didn't change are left alone, rows that are gone are deleted, except for
+        the movie and collection tmdb ids in keep_movies/keep_collections, whose
+        lookups failed this time round. Returns the number of rows written.
+        """
+        self.commit()
+        changes_before = self.conn.total_changes
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        try:
+            self.conn.execute("BEGIN IMMEDIATE")
+            self.conn.executemany(MOVIE_UPSERT_SQL, [movie + (now,) for movie in movies])
+            self.conn.executemany(COLLECTION_UPSERT_SQL, collections)
+            collection_ids = {row['tmdb_id']: row['id'] for row in self.conn.execute("SELECT id, tmdb_id FROM collections")}
+            self.conn.executemany(MISSING_MOVIE_UPSERT_SQL, [(collection_ids[m[0]],) + tuple(m[1:]) for m in missing_movies])
+
+            # Delete whatever the scan no longer found
+            stored_movies = {row['tmdb_id']: row['collection_tmdb_id'] for row in self.conn.execute("SELECT tmdb_id, collection_tmdb_id FROM movies")}
+            wanted_movies = {movie[1] for movie in movies} | set(keep_movies)
+            stale_movies = [(tmdb_id,) for tmdb_id in stored_movies if tmdb_id not in wanted_movies]
+            self.conn.executemany("DELETE FROM movies WHERE tmdb_id = ?", stale_movies)
+
+            # A kept movie is still listed under its single movie collection or its stored collection,
+            # unless this scan already replaced that collection
+            scanned_collections = {collection[1] for collection in collections}
+            keep_collections = set(keep_collections)
+            for tmdb_id in keep_movies:
+                if tmdb_id in stored_movies:
+                    keep_collections.update(collection_tmdb_id for collection_tmdb_id in (f"movie_{tmdb_id}", stored_movies[tmdb_id])
+                                            if collection_tmdb_id and collection_tmdb_id not in scanned_collections)
+
+            wanted_collections = scanned_collections | keep_collections
+            stale_collections = [(collection_id,) for tmdb_id, collection_id in collection_ids.items() if tmdb_id not in wanted_collections]
+            self.conn.executemany("DELETE FROM missing_movies WHERE collection_id = ?", stale_collections)
+            self.conn.executemany("DELETE FROM collections WHERE id = ?", stale_collections)
+
+            kept_collection_ids = {collection_ids[tmdb_id] for tmdb_id in keep_collections if tmdb_id in collection_ids}
+            wanted_missing = {(collection_ids[m[0]], m[2]) for m in missing_movies}
+            stale_missing = [(row['id'],) for row in self.conn.execute("SELECT id, collection_id, tmdb_id FROM missing_movies")
+                             if (row['collection_id'], row['tmdb_id']) not in wanted_missing and row['collection_id'] not in kept_collection_ids]
+            self.conn.executemany("DELETE FROM missing_movies WHERE id = ?", stale_missing)
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        return self.conn.total_changes - changes_before
+
+    def sync_collection(self, collection, movies, missing_movies):
+        """Swap a single collection's rescan result in with one short transaction.
+
+        Same row shapes as sync_movie_library, for one collection only: the
+        collection and the given movies are upserted and the collection's
+        missing movies are replaced. Movies outside it are left alone.
+        Returns the number of rows written.
+        """
+        self.commit()
+        changes_before = self.conn.total_changes
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        try:
+            self.conn.execute("BEGIN IMMEDIATE")
+            self.conn.executemany(MOVIE_UPSERT_SQL, [movie + (now,) for movie in movies])
+            self.conn.execute(COLLECTION_UPSERT_SQL, collection)
+            collection_id = self.conn.execute("SELECT id FROM collections WHERE tmdb_id = ?", (collection[1],)).fetchone()['id']
+            self.conn.executemany(MISSING_MOVIE_UPSERT_SQL, [(collection_id,) + tuple(m[1:]) for m in missing_movies])
+            wanted_missing = {m[2] for m in missing_movies}
+            stale_missing = [(row['id'],) for row in self.conn.execute("SELECT id, tmdb_id FROM missing_movies WHERE collection_id = ?", (collection_id,))
+                             if row['tmdb_id'] not in wanted_missing]
+            self.conn.executemany("DELETE FROM missing_movies WHERE id = ?", stale_missing)
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        return self.conn.total_changes - changes_before
+
+    def save_movie_ids(self, rows):
+        """Upsert (rating_key, tmdb_id, title, plex_updated_at, source) rows into plex_movie_ids"""
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        self.conn.executemany("""
+            INSERT INTO plex_movie_ids (rating_key, tmdb_id, title, plex_updated_at, source, resolved_at) VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(rating_key) DO UPDATE SET
+                tmdb_id = excluded.tmdb_id, title = excluded.title, plex_updated_at = excluded.plex_updated_at,
+                source = excluded.source, resolved_at = excluded.resolved_at
+            WHERE plex_movie_ids.tmdb_id IS NOT excluded.tmdb_id OR plex_movie_ids.title IS NOT excluded.title
+                OR plex_movie_ids.plex_updated_at IS NOT excluded.plex_updated_at
+        """, [row + (now,) for row in rows])
+        self._wrote(len(rows))
+
+    def checkpoint(self, job_id, item):
+        """Record item as finished for a scan job (no-op outside a job)"""
+        if job_id:
+            self.conn.execute("INSERT OR IGNORE INTO scan_job_checkpoints (job_id, item) VALUES (?, ?)", (job_id, item))
+            self._wrote()
+
+def insert_tv_show(*args, **kwargs):
+    with ScanWriter() as writer:
+        return writer.insert_tv_show(*args, **kwargs)
 
 def get_tv_show_by_title(title):
     conn = get_db_connection()
@@ -97,17 +370,30 @@ def get_tv_show_by_tmdb_id(tmdb_id):
     conn.close()
     return show
 
-def insert_season(tv_show_id, season_number, name, overview, poster_path, air_date):
+def delete_tv_shows(titles):
+    """Delete shows along with their seasons, episodes and genre/network rows"""
     conn = get_db_connection()
     cursor = conn.cursor()
-    cursor.execute("""
-        INSERT OR REPLACE INTO seasons (tv_show_id, season_number, name, overview, poster_path, air_date)
-        VALUES (?, ?, ?, ?, ?, ?)
-    """, (tv_show_id, season_number, name, overview, poster_path, air_date))
+    for title in titles:
+        cursor.execute("SELECT id FROM tv_shows WHERE title = ?", (title,))
+        show_id_row = cursor.fetchone()
+        if show_id_row:
+            show_id = show_id_row['id']
+            # Delete episodes
+            cursor.execute("DELETE FROM episodes WHERE season_id IN (SELECT id FROM seasons WHERE tv_show_id = ?)", (show_id,))
+            # Delete seasons
+            cursor.execute("DELETE FROM seasons WHERE tv_show_id = ?", (show_id,))
+            cursor.execute("DELETE FROM show_genres WHERE tv_show_id = ?", (show_id,))
+            cursor.execute("DELETE FROM show_networks WHERE tv_show_id = ?", (show_id,))
+            cursor.execute("DELETE FROM plex_tv_items WHERE tv_show_id = ?", (show_id,))
+            # Delete show
+            cursor.execute("DELETE FROM tv_shows WHERE id = ?", (show_id,))
     conn.commit()
-    season_id = cursor.lastrowid
     conn.close()
-    return season_id
+
+def insert_season(tv_show_id, season_number, name, overview, poster_path, air_date):
+    with ScanWriter() as writer:
+        return writer.insert_seasons(tv_show_id, [(season_number, name, overview, poster_path, air_date)])[season_number]
 
 def get_season_by_tv_show_id_and_number(tv_show_id, season_number):
     conn = get_db_connection()
@@ -118,14 +404,8 @@ def get_season_by_tv_show_id_and_number(tv_show_id, season_number):
     return season
 
 def insert_episode(season_id, episode_number, name, air_date, overview, still_path, exists_in_plex, resolution, file_path):
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        INSERT OR REPLACE INTO episodes (season_id, episode_number, name, air_date, overview, still_path, exists_in_plex, resolution, file_path)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """, (season_id, episode_number, name, air_date, overview, still_path, exists_in_plex, resolution, file_path))
-    conn.commit()
-    conn.close()
+    with ScanWriter() as writer:
+        writer.insert_episodes([(season_id, episode_number, name, air_date, overview, still_path, exists_in_plex, resolution, file_path)])
 
 def get_episodes_by_season_id(season_id):
     conn = get_db_connection()
@@ -136,16 +416,8 @@ def get_episodes_by_season_id(season_id):
     return episodes
 
 def insert_movie(title, tmdb_id, poster_url, overview, release_date, studio, collection_tmdb_id):
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        INSERT OR REPLACE INTO movies (title, tmdb_id, poster_url, overview, release_date, studio, collection_tmdb_id, last_updated)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-    """, (title, tmdb_id, poster_url, overview, release_date, studio, collection_tmdb_id, datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
-    conn.commit()
-    movie_id = cursor.lastrowid
-    conn.close()
-    return movie_id
+    with ScanWriter() as writer:
+        return writer.insert_movie(title, tmdb_id, poster_url, overview, release_date, studio, collection_tmdb_id)
 
 def get_movie_by_title(title):
     conn = get_db_connection()
@@ -155,14 +427,19 @@ def get_movie_by_title(title):
     conn.close()
     return movie
 
-def insert_collection(name, tmdb_id, poster_url):
+def delete_movie(tmdb_id):
+    """Delete a movie (and its single-movie collection); returns the TMDb collection it belonged to, if any"""
     conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("INSERT OR IGNORE INTO collections (name, tmdb_id, poster_url) VALUES (?, ?, ?)", (name, tmdb_id, poster_url))
+    row = conn.execute("SELECT collection_tmdb_id FROM movies WHERE tmdb_id = ?", (tmdb_id,)).fetchone()
+    conn.execute("DELETE FROM movies WHERE tmdb_id = ?", (tmdb_id,))
+    conn.execute("DELETE FROM collections WHERE tmdb_id = ?", (f"movie_{tmdb_id}",))
     conn.commit()
-    collection_id = cursor.lastrowid
     conn.close()
-    return collection_id
+    return row['collection_tmdb_id'] if row else None
+
+def insert_collection(name, tmdb_id, poster_url):
+    with ScanWriter() as writer:
+        return writer.insert_collection(name, tmdb_id, poster_url)
 
 def get_collection_by_tmdb_id(tmdb_id):
     conn = get_db_connection()
@@ -173,11 +450,8 @@ def get_collection_by_tmdb_id(tmdb_id):
     return collection
 
 def insert_missing_movie(collection_id, title, tmdb_id, poster_url, release_date):
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("INSERT OR IGNORE INTO missing_movies (collection_id, title, tmdb_id, poster_url, release_date) VALUES (?, ?, ?, ?, ?)", (collection_id, title, tmdb_id, poster_url, release_date))
-    conn.commit()
-    conn.close()
+    with ScanWriter() as writer:
+        writer.insert_missing_movies([(collection_id, title, tmdb_id, poster_url, release_date)])
 
 def get_missing_movies_by_collection_id(collection_id):
     conn = get_db_connection()
@@ -187,6 +461,18 @@ def get_missing_movies_by_collection_id(collection_id):
     conn.close()
     return movies
 
+def get_app_state(key, default=None):
+    conn = get_db_connection()
+    row = conn.execute("SELECT value FROM app_state WHERE key = ?", (key,)).fetchone()
+    conn.close()
+    return row['value'] if row else default
+
+def set_app_state(key, value):
+    conn = get_db_connection()
+    conn.execute("INSERT OR REPLACE INTO app_state (key, value) VALUES (?, ?)", (key, value))
+    conn.commit()
+    conn.close()
+
 def get_all_collections():
     conn = get_db_connection()
     cursor = conn.cursor()
@@ -195,32 +481,458 @@ def get_all_collections():
     conn.close()
     return collections
 
-# === UTILITIES ===
-def get_ignored_shows():
-    ignored_shows_path = os.path.join(os.path.dirname(__file__), 'ignore.json')
-    if not os.path.exists(ignored_shows_path):
-        return []
-    
+# === PLEX & QBITTORRENT CLIENTS ===
+PLEX_CLIENT = None
+PLEX_CLIENT_KEY = None
+PLEX_CLIENT_LOCK = threading.Lock()
+
+def get_plex_server():
+    """Process-wide PlexServer, rebuilt only when the configured URL or token changes.
+
+    Connecting costs a round trip to the server's identity endpoint, so scans
+    and request handlers share one client (and its keep-alive session).
+    """
+    global PLEX_CLIENT, PLEX_CLIENT_KEY
+    key = (CONFIG['plex']['url'], CONFIG['plex']['token'])
+    with PLEX_CLIENT_LOCK:
+        if PLEX_CLIENT is None or PLEX_CLIENT_KEY != key:
+            PLEX_CLIENT = PlexServer(*key, session=HTTP_CLIENTS.session('plex'), timeout=HTTP_CLIENTS.timeout('plex')[1])
+            PLEX_CLIENT_KEY = key
+        return PLEX_CLIENT
+
+QBITTORRENT_CLIENT = None
+QBITTORRENT_CLIENT_KEY = None
+QBITTORRENT_CLIENT_LOCK = threading.Lock()
+
+def get_qbittorrent():
+    """Process-wide qBittorrent client, rebuilt only when the configured connection details change"""
+    global QBITTORRENT_CLIENT, QBITTORRENT_CLIENT_KEY
+    key = (CONFIG['qbittorrent']['host'], CONFIG['qbittorrent']['port'], CONFIG['qbittorrent']['username'], CONFIG['qbittorrent']['password'])
+    with QBITTORRENT_CLIENT_LOCK:
+        if QBITTORRENT_CLIENT is None or QBITTORRENT_CLIENT_KEY != key:
+            QBITTORRENT_CLIENT = QBittorrent(*key, timeout=HTTP_CLIENTS.timeout('qbittorrent'), timer=lambda: HTTP_CLIENTS.timer('qbittorrent'),
+                                             on_sync=publish_downloads_delta)
+            QBITTORRENT_CLIENT_KEY = key
+        return QBITTORRENT_CLIENT
+
+def normalize_title(title):
+    """Lowercase and reduce punctuation to single spaces, so 'The.Office' matches 'The Office'"""
+    return ' '.join(re.sub(r'[^a-z0-9]+', ' ', (title or '').lower()).split())
+
+# Release names carry the title first, then year/season/quality markers
+RELEASE_TITLE_END = re.compile(r' (?:(?:19|20)\d{2}|s\d{1,2}(?:e\d{1,3})?|season \d+|complete|720p|1080p|2160p)(?: |$)')
+
+def release_title_candidates(release_title):
+    normalized = normalize_title(release_title)
+    candidates = {normalized}
+    match = RELEASE_TITLE_END.search(normalized)
+    if match:
+        candidates.add(normalized[:match.start()])
+    return candidates
+
+class OwnedTitlesIndex:
+    """In-memory set of owned movie and show titles (normalized) and TMDb ids.
+
+    Built from the scan results in SQLite and swapped in whole by refresh(),
+    which the scans call when they finish, so lookups never touch Plex or
+    the database.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._index = None
+        self.refreshed_at = None
+
+    def refresh(self):
+        conn = get_db_connection()
+        shows = conn.execute("SELECT title, tmdb_id FROM tv_shows").fetchall()
+        movies = conn.execute("SELECT title, tmdb_id FROM movies").fetchall()
+        conn.close()
+        if not shows and not movies:
+            # Nothing scanned yet, fall back to a one-off listing of the Plex libraries
+            try:
+                plex = get_plex_server()
+                shows = [{'title': s.title, 'tmdb_id': None} for s in plex.library.section(CONFIG['plex']['library_section']).all()]
+                movies = [{'title': m.title, 'tmdb_id': None} for m in plex.library.section(CONFIG['plex']['movie_library_section']).all()]
+            except Exception as e:
+                app.logger.error(f"Could not list Plex libraries for the owned titles index: {e}")
+        index = {
+            'tv': ({normalize_title(row['title']) for row in shows}, {str(row['tmdb_id']) for row in shows if row['tmdb_id']}),
+            'movies': ({normalize_title(row['title']) for row in movies}, {str(row['tmdb_id']) for row in movies if row['tmdb_id']})
+        }
+        with self._lock:
+            self._index = index
+            self.refreshed_at = datetime.now()
+        app.logger.debug(f"Owned titles index refreshed: {len(index['tv'][0])} shows, {len(index['movies'][0])} movies.")
+
+    def owns(self, category, title, tmdb_id=None):
+        if self._index is None:
+            self.refresh()
+        if category not in self._index:
+            return False
+        titles, tmdb_ids = self._index[category]
+        if tmdb_id and str(tmdb_id) in tmdb_ids:
+            return True
+        return not titles.isdisjoint(release_title_candidates(title))
+
+OWNED_TITLES = OwnedTitlesIndex()
+
+class IgnoredShowsIndex:
+    """The ignore list, stored in the ignored_shows table, with a cached set of ignored titles.
+
+    Scans check every Plex show against the set, so it is only rebuilt after
+    the list changes. Scanned shows whose TMDb id is ignored count as ignored
+    under their current title too, so a show Plex renames stays ignored.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._titles = None
+
+    def titles(self):
+        with self._lock:
+            if self._titles is None:
+                conn = get_db_connection()
+                rows = conn.execute("""
+                    SELECT title FROM ignored_shows
+                    UNION
+                    SELECT t.title FROM tv_shows t JOIN ignored_shows i ON i.tmdb_id = t.tmdb_id
+                """).fetchall()
+                conn.close()
+                self._titles = frozenset(row['title'] for row in rows)
+            return self._titles
+
+    def invalidate(self):
+        with self._lock:
+            self._titles = None
+
+    def is_ignored(self, title):
+        return title in self.titles()
+
+    def entries(self):
+        conn = get_db_connection()
+        rows = conn.execute("SELECT title, tmdb_id, ignored_at FROM ignored_shows ORDER BY title").fetchall()
+        conn.close()
+        return rows
+
+    def ignore(self, titles):
+        """Add titles to the ignore list in one transaction; returns how many were newly ignored"""
+        conn = get_db_connection()
+        with conn:
+            changed = conn.executemany("""
+                INSERT OR IGNORE INTO ignored_shows (title, tmdb_id, ignored_at)
+                VALUES (?, (SELECT tmdb_id FROM tv_shows WHERE title = ?), datetime('now', 'localtime'))
+            """, [(title, title) for title in titles]).rowcount
+        conn.close()
+        self.invalidate()
+        return changed
+
+    def unignore(self, titles):
+        """Remove titles, and entries for the same TMDb id under an older title; returns how many rows went"""
+        conn = get_db_connection()
+        with conn:
+            changed = conn.executemany("""
+                DELETE FROM ignored_shows
+                WHERE title = ? OR tmdb_id = (SELECT tmdb_id FROM tv_shows WHERE title = ?)
+            """, [(title, title) for title in titles]).rowcount
+        conn.close()
+        self.invalidate()
+        return changed
+
+IGNORED_SHOWS = IgnoredShowsIndex()
+
+# === LIBRARY QUERIES ===
+# Sort keys for the JSON library API. Every expression is backed by an index
+# (see migrate_003_library_api_indexes) and is paired with the row id so the
+# keyset cursor is unique.
+SHOW_SORTS = {
+    'title': 'title',
+    'vote_average': 'IFNULL(vote_average, 0)',
+    'first_air_date': "IFNULL(first_air_date, '')",
+    'last_updated': "IFNULL(last_updated, '')"
+}
+MOVIE_SORTS = {
+    'title': 'title',
+    'release_date': "IFNULL(release_date, '')"
+}
+API_DEFAULT_LIMIT = 50
+API_MAX_LIMIT = 500
+
+# Anti-join on tv_shows that leaves out ignored shows, by title or TMDb id (both indexed)
+NOT_IGNORED_SHOW = """NOT EXISTS (SELECT 1 FROM ignored_shows i WHERE i.title = tv_shows.title)
+    AND NOT EXISTS (SELECT 1 FROM ignored_shows i WHERE i.tmdb_id = tv_shows.tmdb_id)"""
+
+def get_show_counts(conn):
+    """Complete/incomplete/unknown show counts in a single aggregate query"""
+    row = conn.execute(f"""
+        SELECT COUNT(*) AS total,
+               COALESCE(SUM(status = 'Complete'), 0) AS complete,
+               COALESCE(SUM(status = 'Incomplete'), 0) AS incomplete,
+               COALESCE(SUM(missing_count), 0) AS missing_episodes,
+               COALESCE(SUM(future_count), 0) AS future_episodes
+        FROM tv_shows WHERE {NOT_IGNORED_SHOW}
+    """).fetchone()
+    return {
+        'total': row['total'],
+        'complete': row['complete'],
+        'incomplete': row['incomplete'],
+        'unknown': row['total'] - row['complete'] - row['incomplete'],
+        'missing_episodes': row['missing_episodes'],
+        'future_episodes': row['future_episodes']
+    }
+
+def load_show(conn, title):
+    row = conn.execute('SELECT * FROM tv_shows WHERE title = ?', (title,)).fetchone()
+    if not row:
+        return None
+    show = dict(row)
+    show['genres'] = json.loads(show['genres']) if show['genres'] else []
+    show['networks'] = json.loads(show['networks']) if show['networks'] else []
+    return show
+
+SHOW_EPISODE_FIELDS = ('id', 'season_id', 'episode_number', 'name', 'air_date', 'overview', 'still_path', 'exists_in_plex', 'resolution', 'file_path')
+
+def load_show_seasons(conn, show_id):
+    """{season_number: season with an {episode_number: episode} dict}, from one joined query in (season, episode) order"""
+    rows = conn.execute("""
+        SELECT s.season_number, s.name AS season_name, s.overview AS season_overview, s.poster_path AS season_poster_path, s.air_date AS season_air_date,
+               e.id, e.season_id, e.episode_number, e.name, e.air_date, e.overview, e.still_path, e.exists_in_plex, e.resolution, e.file_path
+        FROM seasons s
+        LEFT JOIN episodes e ON e.season_id = s.id
+        WHERE s.tv_show_id = ?
+        ORDER BY s.season_number, e.episode_number
+    """, (show_id,))
+    seasons = {}
+    for row in rows:
+        season = seasons.get(row['season_number'])
+        if season is None:
+            season = seasons[row['season_number']] = {
+                'name': row['season_name'],
+                'overview': row['season_overview'],
+                'poster_path': row['season_poster_path'],
+                'air_date': row['season_air_date'],
+                'episodes': {}
+            }
+        # Seasons without episodes come back as a single row of NULL episode columns
+        if row['id'] is not None:
+            season['episodes'][row['episode_number']] = {key: row[key] for key in SHOW_EPISODE_FIELDS}
+    return seasons
+
+def show_etag(show, variant):
+    # Every scan of the show bumps last_updated; today is in there because aired vs. upcoming depends on it
+    key = f"{variant}:{show['id']}:{show['last_updated']}:{datetime.now().strftime('%Y-%m-%d')}"
+    return hashlib.sha1(key.encode()).hexdigest()
+
+def not_modified(etag):
+    response = Response(status=304)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+def encode_cursor(sort_value, row_id):
+    return base64.urlsafe_b64encode(json.dumps([sort_value, row_id]).encode()).decode()
+
+def decode_cursor(cursor):
     try:
-        with open(ignored_shows_path, 'r') as f:
-            content = f.read()
-            if not content:
-                return []
-            return json.loads(content)
-    except json.JSONDecodeError:
-        return []
-
-def save_ignored_shows(ignored_list):
-    ignored_shows_path = os.path.join(os.path.dirname(__file__), 'ignore.json')
-    with open(ignored_shows_path, 'w') as f:
-        json.dump(ignored_list, f, indent=2)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return sort_value, int(row_id)
+    except (ValueError, TypeError):
+        raise ValueError('Invalid cursor.')
+
+def keyset_page(conn, table, columns, sort_expr, descending, conditions, params, cursor, limit):
+    """Fetch one page of rows from table ordered by (sort_expr, id), starting after cursor.
+
+    conditions are SQL fragments ANDed together. Returns (rows, next_cursor);
+    next_cursor is None on the last page.
+    """
+    conditions = list(conditions)
+    params = list(params)
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor)
+        conditions.append(f"({sort_expr}, id) {'<' if descending else '>'} (?, ?)")
+        params += [sort_value, row_id]
+    direction = 'DESC' if descending else 'ASC'
+    where = ' AND '.join(conditions) or '1'
+    rows = conn.execute(f"SELECT {columns}, {sort_expr} AS sort_key FROM {table} WHERE {where} ORDER BY {sort_expr} {direction}, id {direction} LIMIT ?",
+                        params + [limit + 1]).fetchall()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1]['sort_key'], rows[-1]['id'])
+    return rows, next_cursor
+
+def parse_page_args(args, sorts, default_sort):
+    """Validate the limit/sort/order/cursor query parameters shared by the library API"""
+    try:
+        limit = int(args.get('limit', API_DEFAULT_LIMIT))
+    except ValueError:
+        raise ValueError('limit must be an integer.')
+    if not 1 <= limit <= API_MAX_LIMIT:
+        raise ValueError(f'limit must be between 1 and {API_MAX_LIMIT}.')
+    sort = args.get('sort', default_sort)
+    if sort not in sorts:
+        raise ValueError(f"sort must be one of: {', '.join(sorts)}.")
+    order = args.get('order', 'asc')
+    if order not in ('asc', 'desc'):
+        raise ValueError('order must be "asc" or "desc".')
+    return limit, sorts[sort], order == 'desc', args.get('cursor')
 
+# === UTILITIES ===
 def get_api_url(source, endpoint):
     if source == 'tmdb':
         return f'https://api.themoviedb.org/3/{endpoint}?api_key={CONFIG["tmdb"]["api_key"]}'
     return None
 
-def get_tmdb_id(plex_show):
+class TokenBucket:
+    """Thread-safe token bucket that adapts its rate to upstream 429 responses.
+
+    acquire() blocks until a token is available. penalize() halves the rate and
+    pauses every caller until the server's Retry-After has passed; the rate then
+    creeps back up towards max_rate with every successful request.
+    """
+
+    def __init__(self, max_rate, capacity=None, min_rate=1.0):
+        self.max_rate = float(max_rate)
+        self.min_rate = min(float(min_rate), self.max_rate)
+        self.rate = self.max_rate
+        self.capacity = float(capacity or max_rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                if now >= self.blocked_until:
+                    self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                    self.updated = now
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait = (1 - self.tokens) / self.rate
+                else:
+                    wait = self.blocked_until - now
+            time.sleep(wait)
+
+    def penalize(self, retry_after):
+        with self.lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.tokens = 0
+            self.updated = time.monotonic()
+            self.blocked_until = max(self.blocked_until, self.updated + retry_after)
+
+    def reward(self):
+        with self.lock:
+            if self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + 0.1)
+
+# TMDb allows roughly 40-50 requests per second per IP
+TMDB_LIMITER = TokenBucket(CONFIG.get('tmdb', {}).get('rate_limit_per_second', 40))
+TMDB_MAX_RETRIES = 5
+
+def tmdb_request(url, params, headers):
+    """GET a TMDb URL through the shared rate limiter, waiting out 429 responses"""
+    for attempt in range(TMDB_MAX_RETRIES + 1):
+        TMDB_LIMITER.acquire()
+        r = HTTP_CLIENTS.session('tmdb').get(url, params=params, headers=headers)
+        if r.status_code != 429 or attempt == TMDB_MAX_RETRIES:
+            break
+        try:
+            retry_after = float(r.headers.get('Retry-After', 1))
+        except ValueError:
+            retry_after = 1.0
+        app.logger.warning(f"TMDb rate limit hit, backing off for {retry_after}s")
+        TMDB_LIMITER.penalize(retry_after)
+    if r.status_code < 400:
+        TMDB_LIMITER.reward()
+    return r
+
+def tmdb_cache_ttl(endpoint, data):
+    """Pick a cache lifetime (seconds) for a TMDb response based on how likely it is to change"""
+    parts = endpoint.split('/')
+    if parts[0] == 'tv' and len(parts) == 2:
+        status = data.get('status')
+        if status in ['Ended', 'Canceled']:
+            tier = 'ended_series'
+        elif status == 'Returning Series':
+            tier = 'returning_series'
+        else:
+            tier = 'other_series'
+    elif parts[0] == 'tv' and len(parts) == 4 and parts[2] == 'season':
+        # A season is "past" once every episode has aired more than a month ago
+        air_dates = [ep.get('air_date') for ep in data.get('episodes', [])]
+        cutoff = datetime.fromtimestamp(time.time() - 30 * 86400).strftime('%Y-%m-%d')
+        if air_dates and all(air_dates) and max(air_dates) < cutoff:
+            tier = 'past_season'
+        else:
+            tier = 'current_season'
+    elif parts[0] == 'movie':
+        tier = 'movie'
+    elif parts[0] == 'collection':
+        tier = 'collection'
+    elif parts[0] == 'search':
+        tier = 'search'
+    else:
+        tier = 'default'
+    return TMDB_CACHE_TTL_HOURS[tier] * 3600
+
+def tmdb_cache_key(endpoint, params=None):
+    return endpoint + ('?' + urlencode(sorted(params.items())) if params else '')
+
+def tmdb_cached(endpoint, params=None):
+    """Return a fresh cached TMDb response without going to the network, or None"""
+    if not TMDB_CACHE_CONFIG.get('enabled', True):
+        return None
+    cached = TMDB_CACHE.get(tmdb_cache_key(endpoint, params))
+    if cached and cached['fresh']:
+        TMDB_CACHE.record('hits')
+        return cached['data']
+    return None
+
+def tmdb_get(endpoint, params=None, stats=None, use_cache=True):
+    """Fetch a TMDb endpoint as JSON, going through the on-disk response cache.
+
+    Fresh entries are served without touching the network. Stale entries are
+    revalidated with If-None-Match/If-Modified-Since so an unchanged resource
+    costs a 304 instead of a full download. HTTP errors are raised like
+    requests' raise_for_status(). If a stats dict is passed, its
+    'http_requests' counter is bumped for every request that hits the network.
+    """
+    url = get_api_url('tmdb', endpoint)
+    if not url: return None
+    params = dict(params or {})
+    cache_key = tmdb_cache_key(endpoint, params)
+
+    use_cache = use_cache and TMDB_CACHE_CONFIG.get('enabled', True)
+    cached = TMDB_CACHE.get(cache_key) if use_cache else None
+    if cached and cached['fresh']:
+        TMDB_CACHE.record('hits')
+        return cached['data']
+
+    headers = {}
+    if cached:
+        if cached['etag']:
+            headers['If-None-Match'] = cached['etag']
+        if cached['last_modified']:
+            headers['If-Modified-Since'] = cached['last_modified']
+
+    if stats is not None:
+        stats['http_requests'] = stats.get('http_requests', 0) + 1
+    r = tmdb_request(url, params, headers)
+    if r.status_code == 304 and cached:
+        TMDB_CACHE.record('revalidated')
+        TMDB_CACHE.refresh(cache_key, tmdb_cache_ttl(endpoint, cached['data']))
+        return cached['data']
+    r.raise_for_status()
+    data = r.json()
+    if use_cache:
+        TMDB_CACHE.record('misses')
+        TMDB_CACHE.put(cache_key, data, tmdb_cache_ttl(endpoint, data), r.headers.get('ETag'), r.headers.get('Last-Modified'))
+    return data
+
+def get_tmdb_id(plex_show, stats=None):
     title = plex_show.title
     guid = plex_show.guid or ''
     if 'tmdb' in guid:
@@ -228,44 +940,78 @@ def get_tmdb_id(plex_show):
     for guid_obj in plex_show.guids:
         if 'tmdb' in guid_obj.id.lower():
             return guid_obj.id.split('//')[1].split('?')[0]
-    search_url = get_api_url('tmdb', f'search/tv?query={requests.utils.quote(title)}')
-    if not search_url: return None
     try:
-        r = requests.get(search_url)
-        r.raise_for_status()
-        results = r.json()['results']
+        results = tmdb_get('search/tv', {'query': title}, stats=stats)['results']
         if results:
             return str(results[0]['id'])
     except:
         pass
     return None
 
+def parse_show_details(data):
+    """Extract the fields we keep from a TMDb tv/{id} response"""
+    return {
+        'poster_path': f'https://image.tmdb.org/t/p/w500{data.get("poster_path")}' if data.get('poster_path') else None,
+        'backdrop_path': f'https://image.tmdb.org/t/p/original{data.get("backdrop_path")}' if data.get('backdrop_path') else None,
+        'overview': data.get('overview'),
+        'first_air_date': data.get('first_air_date'),
+        'status': data.get('status', 'Unknown'),
+        'number_of_seasons': data.get('number_of_seasons', 0),
+        'number_of_episodes': data.get('number_of_episodes', 0),
+        'genres': [genre['name'] for genre in data.get('genres', [])],
+        'vote_average': data.get('vote_average'),
+        'networks': [network['name'] for network in data.get('networks', [])]
+    }
+
+def parse_series_status(data):
+    status = data.get('status', 'Unknown')
+    if status in ["Ended", "Canceled"]:
+        return "Ended"
+    elif status == "Returning Series":
+        return "Ongoing"
+    else:
+        last_air_date = data.get('last_air_date')
+        if last_air_date:
+            try:
+                last_date = datetime.strptime(last_air_date, '%Y-%m-%d')
+                # Set to start of day for today's date
+                today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+                if last_date >= today_start:
+                    return "Ongoing"
+            except:
+                pass
+        return status
+
+def parse_season_details(season_number, data):
+    """Extract the season fields and episode list from a TMDb tv/{id}/season/{n} response"""
+    episodes = []
+    for ep in data.get('episodes', []):
+        episodes.append({
+            'episode_number': ep.get('episode_number'),
+            'name': ep.get('name'),
+            'air_date': ep.get('air_date'),
+            'overview': ep.get('overview'),
+            'still_path': f'https://image.tmdb.org/t/p/w300{ep.get("still_path")}' if ep.get('still_path') else None
+        })
+    
+    return {
+        'season_number': season_number,
+        'name': data.get('name'),
+        'overview': data.get('overview'),
+        'poster_path': f'https://image.tmdb.org/t/p/w300{data.get("poster_path")}' if data.get('poster_path') else None,
+        'air_date': data.get('air_date'),
+        'episodes': episodes
+    }
+
 def get_show_details(tmdb_id):
     """Get detailed information about a show from TMDb"""
     if not tmdb_id:
         return None
     
-    url = get_api_url('tmdb', f'tv/{tmdb_id}')
-    if not url: return None
     try:
-        r = requests.get(url)
-        r.raise_for_status()
-        data = r.json()
-        
-        # Extract relevant information
-        details = {
-            'poster_path': f'https://image.tmdb.org/t/p/w500{data.get("poster_path")}' if data.get('poster_path') else None,
-            'backdrop_path': f'https://image.tmdb.org/t/p/original{data.get("backdrop_path")}' if data.get('backdrop_path') else None,
-            'overview': data.get('overview'),
-            'first_air_date': data.get('first_air_date'),
-            'status': data.get('status', 'Unknown'),
-            'number_of_seasons': data.get('number_of_seasons', 0),
-            'number_of_episodes': data.get('number_of_episodes', 0),
-            'genres': [genre['name'] for genre in data.get('genres', [])],
-            'vote_average': data.get('vote_average'),
-            'networks': [network['name'] for network in data.get('networks', [])]
-        }
-        return details
+        data = tmdb_get(f'tv/{tmdb_id}')
+        if not data: return None
+        return parse_show_details(data)
     except Exception as e:
         print(f"Error fetching show details: {e}")
         return None
@@ -274,71 +1020,103 @@ def get_show_poster(tmdb_id):
     if not tmdb_id:
         return None
     
-    url = get_api_url('tmdb', f'tv/{tmdb_id}')
-    if not url: return None
     try:
-        r = requests.get(url)
-        r.raise_for_status()
-        data = r.json()
-        poster_path = data.get('poster_path')
-        if poster_path:
-            return f'https://image.tmdb.org/t/p/w500{poster_path}'
+        data = tmdb_get(f'tv/{tmdb_id}')
+        if not data: return None
+        return parse_show_details(data)['poster_path']
     except:
         pass
     return None
 
 def get_series_status(tmdb_id):
-    url = get_api_url('tmdb', f'tv/{tmdb_id}')
-    if not url: return None
     try:
-        r = requests.get(url)
-        r.raise_for_status()
-        data = r.json()
-        status = data.get('status', 'Unknown')
-        if status in ["Ended", "Canceled"]:
-            return "Ended"
-        elif status == "Returning Series":
-            return "Ongoing"
-        else:
-            last_air_date = data.get('last_air_date')
-            if last_air_date:
-                try:
-                    last_date = datetime.strptime(last_air_date, '%Y-%m-%d')
-                    # Set to start of day for today's date
-                    today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-                    if last_date >= today_start:
-                        return "Ongoing"
-                except:
-                    pass
-            return status
+        data = tmdb_get(f'tv/{tmdb_id}')
+        if not data: return None
+        return parse_series_status(data)
     except:
         return "Unknown"
 
-def get_movie_tmdb_id(plex_movie):
+def movie_guid_tmdb_id(plex_movie):
     for guid in plex_movie.guids:
         if 'tmdb' in guid.id:
             return guid.id.split('//')[1]
-    search_url = get_api_url('tmdb', f'search/movie?query={requests.utils.quote(plex_movie.title)}')
-    if not search_url: return None
+    return None
+
+def search_movie_tmdb_id(title):
+    """TMDb id of the best title match, or None when there is none. Request errors propagate."""
+    results = tmdb_get('search/movie', {'query': title})['results']
+    return str(results[0]['id']) if results else None
+
+def get_movie_tmdb_id(plex_movie):
+    tmdb_id = movie_guid_tmdb_id(plex_movie)
+    if tmdb_id:
+        return tmdb_id
     try:
-        r = requests.get(search_url)
-        r.raise_for_status()
-        results = r.json()['results']
-        if results:
-            return str(results[0]['id'])
+        return search_movie_tmdb_id(plex_movie.title)
     except:
         pass
     return None
 
+def resolve_movie_tmdb_ids(plex_movies, executor):
+    """Map every Plex movie's ratingKey to its TMDb id in one pass.
+
+    GUIDs are read first. Movies without a TMDb GUID reuse the id stored by
+    an earlier scan as long as Plex hasn't updated the item since, so only
+    new or changed ones are title-searched, concurrently on executor. The
+    mapping is stored for the next scan; failed searches aren't, so they are
+    retried, and meanwhile the movie keeps the id an earlier scan stored. A
+    stop request cancels the searches still queued.
+    """
+    conn = get_db_connection()
+    known = {row['rating_key']: row for row in conn.execute("SELECT rating_key, tmdb_id, plex_updated_at FROM plex_movie_ids")}
+    conn.close()
+
+    resolved = {}
+    rows = []
+    to_search = []
+    for movie in plex_movies:
+        rating_key = str(movie.ratingKey)
+        updated_at = int(movie.updatedAt.timestamp()) if getattr(movie, 'updatedAt', None) else None
+        tmdb_id = movie_guid_tmdb_id(movie)
+        if tmdb_id:
+            resolved[rating_key] = tmdb_id
+            rows.append((rating_key, tmdb_id, movie.title, updated_at, 'guid'))
+            continue
+        row = known.get(rating_key)
+        if row and row['plex_updated_at'] is not None and row['plex_updated_at'] == updated_at:
+            resolved[rating_key] = row['tmdb_id']
+            continue
+        to_search.append((movie, rating_key, updated_at))
+
+    futures = {executor.submit(search_movie_tmdb_id, movie.title): (movie, rating_key, updated_at) for movie, rating_key, updated_at in to_search}
+    for future in as_completed(futures):
+        if MOVIE_SCAN_STATUS['stop_requested']:
+            # Drop the searches that haven't started; the ones already answered are still saved
+            for queued in futures:
+                queued.cancel()
+            break
+        movie, rating_key, updated_at = futures[future]
+        try:
+            tmdb_id = future.result()
+        except Exception as e:
+            # An error isn't "no match": keep the id from the last scan so the movie's rows are left alone
+            app.logger.error(f"Error searching TMDb for movie {movie.title}: {e}")
+            resolved[rating_key] = known[rating_key]['tmdb_id'] if rating_key in known else None
+            continue
+        resolved[rating_key] = tmdb_id
+        rows.append((rating_key, tmdb_id, movie.title, updated_at, 'search'))
+
+    with ScanWriter() as writer:
+        writer.save_movie_ids(rows)
+    app.logger.debug(f"Resolved {len(resolved)} movie ids, {len(to_search)} by title search.")
+    return resolved
+
 def get_movie_details(tmdb_id):
     if not tmdb_id:
         return None
-    url = get_api_url('tmdb', f'movie/{tmdb_id}')
-    if not url: return None
     try:
-        r = requests.get(url)
-        r.raise_for_status()
-        data = r.json()
+        data = tmdb_get(f'movie/{tmdb_id}')
+        if not data: return None
         studio = data['production_companies'][0]['name'] if data['production_companies'] else None
         return {
             'title': data.get('title'),
@@ -352,101 +1130,410 @@ def get_movie_details(tmdb_id):
         return None
 
 def fetch_tmdb_episodes(tmdb_id):
-    eps = set()
-    try:
-        show_info_url = get_api_url('tmdb', f'tv/{tmdb_id}')
-        if not show_info_url: return eps
-        show_info = requests.get(show_info_url).json()
-        for season_num in range(1, show_info.get('number_of_seasons', 0) + 1):
-            season_url = get_api_url('tmdb', f'tv/{tmdb_id}/season/{season_num}')
-            if not season_url: continue
-            season = requests.get(season_url).json()
-            for ep in season.get('episodes', []):
-                eps.add((season_num, ep['episode_number']))
-    except:
-        pass
-    return eps
+    return build_show_snapshot(tmdb_id).episodes
+
+# Episodes per page when listing a whole TV section
+PLEX_EPISODE_PAGE_SIZE = 2000
+# Scans of fewer shows than this list each show's episodes instead of the whole section
+PLEX_BULK_EPISODES_MIN_SHOWS = 25
+
+def parse_plex_episodes(container, episodes_by_show):
+    """Add the episodes of a raw Plex XML listing to {show ratingKey: (existing, episode_details)}.
+
+    Reads the attributes straight off the XML instead of building a plexapi
+    Episode (and its media/part objects) for every episode.
+    """
+    for video in container.iter('Video'):
+        season_number = int(video.get('parentIndex') or 0)
+        index = int(video.get('index') or 0)
+        if not season_number or not index:
+            continue
+        existing, episode_details = episodes_by_show.setdefault(video.get('grandparentRatingKey'), (set(), {}))
+        # Add to set of existing episodes
+        existing.add((season_number, index))
+
+        # Resolution and file come from the first media item that has them
+        resolution = "Unknown"
+        file_path = None
+        for media in video.iter('Media'):
+            if resolution == "Unknown" and media.get('videoResolution'):
+                resolution = media.get('videoResolution')
+            part = media.find('Part')
+            if file_path is None and part is not None:
+                file_path = part.get('file')
+
+        episode_details.setdefault(season_number, {})[index] = {
+            'rating_key': video.get('ratingKey'),
+            'season_rating_key': video.get('parentRatingKey'),
+            'title': video.get('title'),
+            'resolution': resolution,
+            'file': file_path,
+            'air_date': video.get('originallyAvailableAt')
+        }
+
+def fetch_section_episodes(section):
+    """Existing episodes of every show in a TV section, in a few paged requests.
+
+    Returns {show ratingKey: (existing, episode_details)}, each entry shaped
+    like get_existing_episodes().
+    """
+    plex = get_plex_server()
+    episodes_by_show = {}
+    start = 0
+    while True:
+        container = plex.query(f'/library/sections/{section.key}/all?type=4', headers={
+            'X-Plex-Container-Start': str(start),
+            'X-Plex-Container-Size': str(PLEX_EPISODE_PAGE_SIZE)
+        })
+        page_size = int(container.get('size') or len(container.findall('Video')))
+        parse_plex_episodes(container, episodes_by_show)
+        start += page_size
+        total = int(container.get('totalSize') or 0)
+        # Without totalSize a short page is the last one
+        if not page_size or (start >= total if total else page_size < PLEX_EPISODE_PAGE_SIZE):
+            break
+    return episodes_by_show
 
 def get_existing_episodes(plex_show):
-    existing = set()
-    episode_details = {}
-    
-    for episode in plex_show.episodes():
-        if episode.seasonNumber and episode.index:
-            # Add to set of existing episodes
-            existing.add((episode.seasonNumber, episode.index))
-            
-            # Get resolution
-            resolution = "Unknown"
-            if episode.media:
-                for media in episode.media:
-                    if media.videoResolution:
-                        resolution = media.videoResolution
-                        break
-            
-            # Store episode details
-            if episode.seasonNumber not in episode_details:
-                episode_details[episode.seasonNumber] = {}
-            
-            episode_details[episode.seasonNumber][episode.index] = {
-                'title': episode.title,
-                'resolution': resolution,
-                'file': episode.locations[0] if episode.locations else None,
-                'air_date': episode.originallyAvailableAt.strftime('%Y-%m-%d') if episode.originallyAvailableAt else None
-            }
-    
-    return existing, episode_details
+    episodes_by_show = {}
+    parse_plex_episodes(get_plex_server().query(f'/library/metadata/{plex_show.ratingKey}/allLeaves'), episodes_by_show)
+    return episodes_by_show.get(str(plex_show.ratingKey), (set(), {}))
 
 def get_season_details(tmdb_id, season_number):
     """Get details for a specific season including episodes"""
     if not tmdb_id or not season_number:
         return None
     
-    url = get_api_url('tmdb', f'tv/{tmdb_id}/season/{season_number}')
-    if not url: return None
     try:
-        r = requests.get(url)
-        r.raise_for_status()
-        data = r.json()
-        
-        # Process and return episodes
-        episodes = []
-        for ep in data.get('episodes', []):
-            episodes.append({
-                'episode_number': ep.get('episode_number'),
-                'name': ep.get('name'),
-                'air_date': ep.get('air_date'),
-                'overview': ep.get('overview'),
-                'still_path': f'https://image.tmdb.org/t/p/w300{ep.get("still_path")}' if ep.get('still_path') else None
-            })
-        
-        return {
-            'season_number': season_number,
-            'name': data.get('name'),
-            'overview': data.get('overview'),
-            'poster_path': f'https://image.tmdb.org/t/p/w300{data.get("poster_path")}' if data.get('poster_path') else None,
-            'air_date': data.get('air_date'),
-            'episodes': episodes
-        }
+        data = tmdb_get(f'tv/{tmdb_id}/season/{season_number}')
+        if not data: return None
+        return parse_season_details(season_number, data)
     except Exception as e:
         print(f"Error fetching season details: {e}")
         return None
 
-def run_scan_thread():
-    global SCAN_STATUS
-    
+# TMDb accepts at most 20 sub-requests in one append_to_response
+TMDB_APPEND_LIMIT = 20
+
+class ShowSnapshot:
+    """Everything a scan needs to know about one show on TMDb, fetched once.
+
+    Built by build_show_snapshot() from one series request plus the seasons
+    that aren't already fresh in the cache, so the scan never asks TMDb for
+    the same resource twice.
+    """
+
+    def __init__(self, tmdb_id, series, seasons, http_requests):
+        self.tmdb_id = tmdb_id
+        self.series = series
+        self.seasons = seasons
+        self.http_requests = http_requests
+
+    @property
+    def details(self):
+        return parse_show_details(self.series) if self.series else None
+
+    @property
+    def poster_url(self):
+        return self.details['poster_path'] if self.series else None
+
+    @property
+    def series_status(self):
+        return parse_series_status(self.series) if self.series else 'Unknown'
+
+    @property
+    def episodes(self):
+        """Set of (season_number, episode_number) known to TMDb"""
+        return {(season_num, ep['episode_number']) for season_num, season in self.seasons.items() for ep in season['episodes']}
+
+    @property
+    def air_dates(self):
+        """{(season_number, episode_number): ISO air date or None} for every TMDb episode"""
+        return {(season_num, ep['episode_number']): ep.get('air_date') for season_num, season in self.seasons.items() for ep in season['episodes']}
+
+    def season_details(self, season_number):
+        return self.seasons.get(season_number)
+
+def build_show_snapshot(tmdb_id):
+    """Fetch a show and all of its seasons from TMDb with as few requests as possible.
+
+    Seasons that are still fresh in the cache cost nothing. The rest are
+    fetched through the series endpoint with append_to_response, up to
+    TMDB_APPEND_LIMIT seasons per call, and each season is written back to the
+    cache under its own key so it keeps its own TTL.
+    """
+    stats = {'http_requests': 0}
     try:
-        SCAN_STATUS['in_progress'] = True
-        SCAN_STATUS['progress'] = 0
-        SCAN_STATUS['status_message'] = 'Connecting to Plex server...'
-        SCAN_STATUS['start_time'] = datetime.now()
-        SCAN_STATUS['stop_requested'] = False
+        series = tmdb_get(f'tv/{tmdb_id}', stats=stats)
+    except Exception as e:
+        app.logger.error(f"Error fetching TMDb series {tmdb_id}: {e}")
+        return ShowSnapshot(tmdb_id, None, {}, stats['http_requests'])
+
+    raw_seasons = {}
+    pending = []
+    for season_num in range(1, (series or {}).get('number_of_seasons', 0) + 1):
+        cached = tmdb_cached(f'tv/{tmdb_id}/season/{season_num}')
+        if cached is not None:
+            raw_seasons[season_num] = cached
+        else:
+            pending.append(season_num)
+
+    if len(pending) == 1:
+        # A single season is cheaper as a plain (conditionally revalidated) request
+        try:
+            raw_seasons[pending[0]] = tmdb_get(f'tv/{tmdb_id}/season/{pending[0]}', stats=stats)
+        except Exception as e:
+            app.logger.error(f"Error fetching TMDb season {pending[0]} of {tmdb_id}: {e}")
+    else:
+        for i in range(0, len(pending), TMDB_APPEND_LIMIT):
+            batch = pending[i:i + TMDB_APPEND_LIMIT]
+            try:
+                data = tmdb_get(f'tv/{tmdb_id}', {'append_to_response': ','.join(f'season/{n}' for n in batch)}, stats=stats, use_cache=False)
+            except Exception as e:
+                app.logger.error(f"Error fetching TMDb seasons {batch} of {tmdb_id}: {e}")
+                continue
+            for season_num in batch:
+                season = data.get(f'season/{season_num}')
+                if not season:
+                    continue
+                raw_seasons[season_num] = season
+                if TMDB_CACHE_CONFIG.get('enabled', True):
+                    endpoint = f'tv/{tmdb_id}/season/{season_num}'
+                    TMDB_CACHE.put(endpoint, season, tmdb_cache_ttl(endpoint, season))
+
+    seasons = {n: parse_season_details(n, data) for n, data in raw_seasons.items() if data}
+    return ShowSnapshot(tmdb_id, series, seasons, stats['http_requests'])
+
+# TMDb's change feed only covers the last 14 days
+TMDB_CHANGES_MAX_DAYS = 14
+
+def plex_watermark(plex_show):
+    """What Plex tells us about a show that changes whenever its episodes do"""
+    updated_at = getattr(plex_show, 'updatedAt', None)
+    return {
+        'plex_updated_at': int(updated_at.timestamp()) if updated_at else None,
+        'plex_leaf_count': getattr(plex_show, 'leafCount', None)
+    }
+
+def show_watermark(plex_show, snapshot):
+    watermark = plex_watermark(plex_show)
+    series = snapshot.series or {}
+    watermark['tmdb_last_air_date'] = series.get('last_air_date')
+    watermark['tmdb_next_episode_air_date'] = (series.get('next_episode_to_air') or {}).get('air_date')
+    return watermark
+
+def fetch_tmdb_changed_tv_ids(since):
+    """Ids of every series TMDb reports as changed since the given datetime"""
+    changed = set()
+    page = 1
+    total_pages = 1
+    while page <= total_pages:
+        data = tmdb_get('tv/changes', {'start_date': since.strftime('%Y-%m-%d'), 'page': page}, use_cache=False)
+        changed.update(str(item['id']) for item in data.get('results', []))
+        total_pages = data.get('total_pages', 1)
+        page += 1
+    return changed
+
+def find_dirty_shows(shows, changed_tmdb_ids):
+    """Shows whose Plex watermark moved, that TMDb reports as changed, or that had an episode air since the last scan"""
+    conn = get_db_connection()
+    rows = conn.execute("SELECT title, tmdb_id, plex_updated_at, plex_leaf_count, tmdb_next_episode_air_date FROM tv_shows").fetchall()
+    conn.close()
+    stored = {row['title']: row for row in rows}
+    today = datetime.now().strftime('%Y-%m-%d')
+
+    dirty = []
+    for show in shows:
+        row = stored.get(show.title)
+        watermark = plex_watermark(show)
+        if (row is None
+                or row['plex_updated_at'] != watermark['plex_updated_at']
+                or row['plex_leaf_count'] != watermark['plex_leaf_count']
+                or (row['tmdb_id'] and row['tmdb_id'] in changed_tmdb_ids)
+                or (row['tmdb_next_episode_air_date'] and row['tmdb_next_episode_air_date'] <= today)):
+            dirty.append(show)
+    return dirty
+
+def set_scan_status(**updates):
+    with SCAN_STATUS_LOCK:
+        SCAN_STATUS.update(updates)
+
+def get_scan_status():
+    """Consistent copy of SCAN_STATUS"""
+    with SCAN_STATUS_LOCK:
+        return dict(SCAN_STATUS)
+
+def mark_show_processed():
+    with SCAN_STATUS_LOCK:
+        SCAN_STATUS['processed_shows'] += 1
+        SCAN_STATUS['progress'] = (SCAN_STATUS['processed_shows'] / SCAN_STATUS['total_shows']) * 100
+
+def scan_show(show, job_id=None, progress=True, episodes=None):
+    """Fetch, compare and store one Plex show. Safe to run from several worker threads.
+
+    progress=False is for targeted rescans outside a library scan: the scan
+    status and its counters are left alone. episodes is the show's entry from
+    fetch_section_episodes(); without it the show's episodes are listed on their own.
+    """
+    if progress and SCAN_STATUS['stop_requested']:
+        return
+    status = set_scan_status if progress else (lambda **updates: None)
+    app.logger.debug(f"Processing show: {show.title}")
+    status(current_show=show.title, status_message=f'Processing {show.title}...')
+
+    show_id = None
+    poster_url = None
+    details = None
+    series_status = 'Unknown'
+    all_eps = set()
+    request_stats = {'http_requests': 0}
+
+    status(status_message=f'Finding TMDb match for {show.title}...')
+    show_id = get_tmdb_id(show, stats=request_stats)
+    app.logger.debug(f"TMDb ID for {show.title}: {show_id}")
+    if show_id:
+        snapshot = build_show_snapshot(show_id)
+        request_stats['http_requests'] += snapshot.http_requests
+        poster_url = snapshot.poster_url
+        details = snapshot.details
+        series_status = snapshot.series_status
+        all_eps = snapshot.episodes
+        app.logger.debug(f"Fetched TMDB details for {show.title} with {request_stats['http_requests']} HTTP requests.")
+
+    if progress:
+        with SCAN_STATUS_LOCK:
+            SCAN_STATUS['http_requests'] += request_stats['http_requests']
+            SCAN_STATUS['last_show_http_requests'] = request_stats['http_requests']
+
+    if not show_id:
+        app.logger.debug(f"No metadata ID found for {show.title}. Inserting with Unknown status.")
+        # Insert into DB with unknown status
+        with ScanWriter() as writer:
+            tv_show_id = writer.insert_tv_show(show.title, None, None, None, None, 'Unknown', 'Unknown', 0, 0, [], 0.0, [], watermark=plex_watermark(show))
+            writer.save_plex_tv_items(tv_show_id, [show.ratingKey])
+            writer.checkpoint(job_id, show.title)
+        record_show_completed(show.title, None, 'Unknown', 'Unknown')
+        if progress:
+            mark_show_processed()
+        return
+
+    app.logger.debug(f"Processing {show.title} (ID: {show_id}) from tmdb")
+
+    # Compare episodes
+    status(status_message=f'Comparing episodes for {show.title}...')
+    existing, existing_episode_details = episodes if episodes is not None else get_existing_episodes(show)
+    app.logger.debug(f"DEBUG: Compared episodes for {show.title}. Existing: {len(existing)}, All tmdb: {len(all_eps)}")
+
+    # One set difference against Plex, then one pass over what's left; ISO dates compare correctly as strings
+    today = datetime.now().strftime('%Y-%m-%d')
+    air_dates = snapshot.air_dates
+    not_in_plex = all_eps - existing
+    future_episodes = {key for key in not_in_plex if (air_dates.get(key) or '') >= today}
+    missing = not_in_plex - future_episodes
+
+    # Determine overall status
+    overall_status = 'Complete' if not missing else 'Incomplete'
+
+    # Refine series status based on missing episodes and future episodes
+    if future_episodes:
+        display_series_status = f"{overall_status} - Upcoming"
+    elif series_status == "Returning Series" or series_status == "Continuing": # TVDB uses "Continuing"
+        display_series_status = f"{overall_status} - Ongoing"
+    elif series_status in ["Ended", "Canceled"]:
+        display_series_status = f"{overall_status} - {series_status}"
+    else:
+        display_series_status = "Unknown"
+
+    # One connection and one commit for the whole show
+    with ScanWriter() as writer:
+        app.logger.debug(f"DEBUG: Inserting/Updating TV Show {show.title} in DB.")
+        tv_show_id = writer.insert_tv_show(
+            show.title,
+            show_id,
+            poster_url,
+            details.get('overview') if details else None,
+            details.get('first_air_date') if details else None,
+            overall_status,
+            display_series_status,
+            details.get('number_of_seasons') if details else 0,
+            details.get('number_of_episodes') if details else 0,
+            details.get('genres') if details else [],
+            details.get('vote_average') if details else 0.0,
+            details.get('networks') if details else [],
+            watermark=show_watermark(show, snapshot),
+            missing_count=len(missing),
+            future_count=len(future_episodes)
+        )
+        app.logger.debug(f"DEBUG: TV Show {show.title} (ID: {tv_show_id}) inserted/updated.")
+
+        app.logger.debug(f"DEBUG: Inserting/Updating Seasons and Episodes for {show.title}.")
+        # Insert/Update Seasons and Episodes
+        unique_season_nums = sorted(list(set([s for s, e in all_eps])))
+        season_rows = []
+        for season_num in unique_season_nums:
+            season_details = snapshot.season_details(season_num)
+            if season_details:
+                season_rows.append((
+                    season_num,
+                    season_details.get('name'),
+                    season_details.get('overview'),
+                    season_details.get('poster_path'),
+                    season_details.get('air_date')
+                ))
+        season_ids = writer.insert_seasons(tv_show_id, season_rows)
+
+        episode_rows = []
+        for season_num, *_ in season_rows:
+            for ep in snapshot.season_details(season_num).get('episodes', []):
+                episode_num = int(ep.get('episode_number', 0))
+                exists_in_plex = (season_num, episode_num) in existing
+                resolution = existing_episode_details.get(season_num, {}).get(episode_num, {}).get('resolution')
+                file_path = existing_episode_details.get(season_num, {}).get(episode_num, {}).get('file')
+
+                episode_rows.append((
+                    season_ids[season_num],
+                    episode_num,
+                    ep.get('name'),
+                    ep.get('air_date'),
+                    ep.get('overview'),
+                    ep.get('still_path'),
+                    exists_in_plex,
+                    resolution,
+                    file_path
+                ))
+        writer.insert_episodes(episode_rows)
+        writer.save_plex_tv_items(tv_show_id, {show.ratingKey} | {
+            rating_key for season in existing_episode_details.values() for details in season.values()
+            for rating_key in (details.get('rating_key'), details.get('season_rating_key'))})
+        # Same transaction as the show itself, so a resumed job never skips a half-written show
+        writer.checkpoint(job_id, show.title)
+    app.logger.debug(f"DEBUG: Seasons and Episodes for {show.title} inserted/updated.")
+
+    record_show_completed(show.title, poster_url, overall_status, display_series_status)
+    if progress:
+        mark_show_processed()
+        app.logger.debug(f"DEBUG: Progress for {show.title}: {SCAN_STATUS['progress']}%")
+
+def run_scan_thread(mode='full', job_id=None):
+    """Scan the Plex TV library. Returns the final job state.
+
+    mode='incremental' only rescans shows that changed in Plex or on TMDb
+    since the last completed scan, and falls back to a full scan when there
+    is no usable previous scan to compare against. With a job_id, every
+    finished show is checkpointed and shows the job already finished before
+    an interruption are skipped.
+    """
+    state = 'failed'
+    try:
+        scan_started = datetime.now()
+        set_scan_status(in_progress=True, progress=0, status_message='Connecting to Plex server...', start_time=datetime.now(),
+                        stop_requested=False, http_requests=0, last_show_http_requests=0, total_shows=0, processed_shows=0)
         
         app.logger.debug("Attempting to connect to Plex server...")
-        plex = PlexServer(CONFIG['plex']['url'], CONFIG['plex']['token'])
+        plex = get_plex_server()
         app.logger.debug("Connected to Plex server.")
         
-        SCAN_STATUS['status_message'] = 'Fetching TV Shows...'
+        set_scan_status(status_message='Fetching TV Shows...')
         plex_shows = plex.library.section(CONFIG['plex']['library_section']).all()
         plex_show_titles = {s.title for s in plex_shows}
 
@@ -461,324 +1548,373 @@ def run_scan_thread():
         shows_to_delete = db_show_titles - plex_show_titles
         if shows_to_delete:
             app.logger.debug(f"Deleting {len(shows_to_delete)} shows no longer in Plex: {shows_to_delete}")
-            conn = get_db_connection()
-            cursor = conn.cursor()
-            for title in shows_to_delete:
-                cursor.execute("SELECT id FROM tv_shows WHERE title = ?", (title,))
-                show_id_row = cursor.fetchone()
-                if show_id_row:
-                    show_id = show_id_row['id']
-                    # Delete episodes
-                    cursor.execute("DELETE FROM episodes WHERE season_id IN (SELECT id FROM seasons WHERE tv_show_id = ?)", (show_id,))
-                    # Delete seasons
-                    cursor.execute("DELETE FROM seasons WHERE tv_show_id = ?", (show_id,))
-                    # Delete show
-                    cursor.execute("DELETE FROM tv_shows WHERE id = ?", (show_id,))
-            conn.commit()
-            conn.close()
+            delete_tv_shows(shows_to_delete)
 
         shows = plex_shows
         app.logger.debug(f"Fetched {len(shows)} TV shows from Plex.")
         
-        ignored = get_ignored_shows()
-        
-        # Filter out ignored shows
-        shows = [s for s in shows if s.title not in ignored]
+        # Filter out ignored shows; reloaded so shows scanned since the list changed match by TMDb id
+        IGNORED_SHOWS.invalidate()
+        shows = [s for s in shows if not IGNORED_SHOWS.is_ignored(s.title)]
         app.logger.debug(f"After filtering ignored shows, {len(shows)} remain.")
 
-        SCAN_STATUS['total_shows'] = len(shows)
-        SCAN_STATUS['processed_shows'] = 0
-        
-        app.logger.debug("Starting TV show processing loop.")
-        for show in shows:
-            app.logger.debug(f"Processing show: {show.title}")
-            # Check if stop was requested
-            if SCAN_STATUS['stop_requested']:
-                SCAN_STATUS['status_message'] = 'Scan stopped by user.'
-                app.logger.debug("Scan stop requested. Breaking loop.")
-                break
-                
-            SCAN_STATUS['current_show'] = show.title
-            SCAN_STATUS['status_message'] = f'Processing {show.title}...'
-            
-            
-            show_id = None
-            poster_url = None
-            details = None
-            series_status = 'Unknown'
-            all_eps = set()
-
-            SCAN_STATUS['status_message'] = f'Finding TMDb match for {show.title}...'
-            show_id = get_tmdb_id(show)
-            app.logger.debug(f"TMDb ID for {show.title}: {show_id}")
-            if show_id:
-                poster_url = get_show_poster(show_id)
-                details = get_show_details(show_id)
-                series_status = get_series_status(show_id)
-                all_eps = fetch_tmdb_episodes(show_id)
-                app.logger.debug(f"Fetched TMDB details for {show.title}.")
-
-            if not show_id:
-                app.logger.debug(f"No metadata ID found for {show.title}. Inserting with Unknown status.")
-                # Insert into DB with unknown status
-                insert_tv_show(show.title, None, None, None, None, 'Unknown', 'Unknown', 0, 0, [], 0.0, [])
-                SCAN_STATUS['processed_shows'] += 1
-                SCAN_STATUS['progress'] = (SCAN_STATUS['processed_shows'] / SCAN_STATUS['total_shows']) * 100
-                continue
-            
-            app.logger.debug(f"Processing {show.title} (ID: {show_id}) from tmdb")
-            
-            # Get series status
-            SCAN_STATUS['status_message'] = f'Checking series status for {show.title}...'
-            
-            # Compare episodes
-            SCAN_STATUS['status_message'] = f'Comparing episodes for {show.title}...'
-            existing, existing_episode_details = get_existing_episodes(show)
-            app.logger.debug(f"DEBUG: Compared episodes for {show.title}. Existing: {len(existing)}, All tmdb: {len(all_eps)}")
-            
-            # Filter out future episodes when calculating missing episodes
-            aired_missing = []
-            future_episodes = []
-            
-            # Process missing episodes
-            for season_num, ep_num in sorted(list(all_eps - existing)):
-                air_date = None
-                has_aired = True
-                
-                season_details = get_season_details(show_id, season_num)
-
-                if season_details and 'episodes' in season_details:
-                    for ep in season_details.get('episodes', []):
-                        if ep.get('episode_number') == ep_num:
-                            air_date = ep.get('air_date')
-                            if air_date:
-                                try:
-                                    air_date_obj = datetime.strptime(air_date, '%Y-%m-%d')
-                                    today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-                                    has_aired = air_date_obj < today_start
-                                except:
-                                    has_aired = True
-                            break
-                
-                if has_aired:
-                    aired_missing.append((season_num, ep_num))
-                else:
-                    future_episodes.append((season_num, ep_num))
-            
-            missing = aired_missing
-            
-            # Determine overall status
-            overall_status = 'Complete' if not missing else 'Incomplete'
-
-            # Refine series status based on missing episodes and future episodes
-            if future_episodes:
-                display_series_status = f"{overall_status} - Upcoming"
-            elif series_status == "Returning Series" or series_status == "Continuing": # TVDB uses "Continuing"
-                display_series_status = f"{overall_status} - Ongoing"
-            elif series_status in ["Ended", "Canceled"]:
-                display_series_status = f"{overall_status} - {series_status}"
+        if mode == 'incremental':
+            last_scan = get_app_state('tv_last_scan')
+            last_scan = datetime.strptime(last_scan, '%Y-%m-%d %H:%M:%S') if last_scan else None
+            changed_tmdb_ids = None
+            if last_scan and (scan_started - last_scan).days < TMDB_CHANGES_MAX_DAYS:
+                set_scan_status(status_message='Checking TMDb for changes...')
+                try:
+                    changed_tmdb_ids = fetch_tmdb_changed_tv_ids(last_scan)
+                except requests.exceptions.RequestException as e:
+                    app.logger.error(f"Error fetching TMDb change feed: {e}")
+            if changed_tmdb_ids is not None:
+                library_size = len(shows)
+                shows = find_dirty_shows(shows, changed_tmdb_ids)
+                # Make sure changed series bypass the response cache; the feed covers all of TMDb, so only library shows
+                conn = get_db_connection()
+                library_tmdb_ids = {row['tmdb_id'] for row in conn.execute("SELECT tmdb_id FROM tv_shows WHERE tmdb_id IS NOT NULL")}
+                conn.close()
+                TMDB_CACHE.invalidate(*(f'tv/{tmdb_id}' for tmdb_id in changed_tmdb_ids & library_tmdb_ids))
+                app.logger.info(f"Incremental scan: {len(shows)} of {library_size} shows changed.")
             else:
-                display_series_status = "Unknown"
-
-            app.logger.debug(f"DEBUG: Inserting/Updating TV Show {show.title} in DB.")
-            tv_show_id = insert_tv_show(
-                show.title,
-                show_id,
-                poster_url,
-                details.get('overview') if details else None,
-                details.get('first_air_date') if details else None,
-                overall_status,
-                display_series_status,
-                details.get('number_of_seasons') if details else 0,
-                details.get('number_of_episodes') if details else 0,
-                details.get('genres') if details else [],
-                details.get('vote_average') if details else 0.0,
-                details.get('networks') if details else []
-            )
-            app.logger.debug(f"DEBUG: TV Show {show.title} (ID: {tv_show_id}) inserted/updated.")
-
-            app.logger.debug(f"DEBUG: Inserting/Updating Seasons and Episodes for {show.title}.")
-            # Insert/Update Seasons and Episodes
-            unique_season_nums = sorted(list(set([s for s, e in all_eps])))
-            for season_num in unique_season_nums:
-                season_details = get_season_details(show_id, season_num)
-
-                if season_details:
-                    season_id = insert_season(
-                        tv_show_id,
-                        season_num,
-                        season_details.get('name'),
-                        season_details.get('overview'),
-                        season_details.get('poster_path'),
-                        season_details.get('air_date')
-                    )
-                    for ep in season_details.get('episodes', []):
-                        episode_num = int(ep.get('episode_number', 0))
-                        exists_in_plex = (season_num, episode_num) in existing
-                        resolution = existing_episode_details.get(season_num, {}).get(episode_num, {}).get('resolution')
-                        file_path = existing_episode_details.get(season_num, {}).get(episode_num, {}).get('file')
-                        
-                        insert_episode(
-                            season_id,
-                            episode_num,
-                            ep.get('name'),
-                            ep.get('air_date'),
-                            ep.get('overview'),
-                            ep.get('still_path'),
-                            exists_in_plex,
-                            resolution,
-                            file_path
-                        )
-            app.logger.debug(f"DEBUG: Seasons and Episodes for {show.title} inserted/updated.")
-            
-            SCAN_STATUS['processed_shows'] += 1
-            SCAN_STATUS['progress'] = (SCAN_STATUS['processed_shows'] / SCAN_STATUS['total_shows']) * 100
-            app.logger.debug(f"DEBUG: Progress for {show.title}: {SCAN_STATUS['progress']}%")
-            
-            time.sleep(random.uniform(0.2, 0.5))
-
-        SCAN_STATUS['status_message'] = 'Scan complete.'
+                app.logger.info("No usable previous scan or change feed to compare against, running a full scan.")
+                mode = 'full'
+        # Resuming an interrupted job: skip the shows it already finished
+        finished = SCAN_JOBS.checkpoints(job_id) if job_id else set()
+        if finished:
+            app.logger.info(f"Resuming scan job {job_id}: {len(finished)} shows already done.")
+        library_size = len(shows)
+        shows = [s for s in shows if s.title not in finished]
+        set_scan_status(mode=mode, total_shows=library_size, processed_shows=library_size - len(shows),
+                        progress=((library_size - len(shows)) / library_size) * 100 if library_size else 0)
+        
+        # One paged listing of the whole section instead of one request per show
+        episodes_by_show = None
+        if len(shows) >= PLEX_BULK_EPISODES_MIN_SHOWS:
+            set_scan_status(status_message='Fetching episodes from Plex...')
+            episodes_by_show = fetch_section_episodes(plex.library.section(CONFIG['plex']['library_section']))
+
+        workers = max(1, int(CONFIG.get('scan', {}).get('tv_workers', 4)))
+        app.logger.debug(f"Starting TV show processing with {workers} workers.")
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='tv-scan')
+        try:
+            futures = [executor.submit(scan_show, show, job_id,
+                                       episodes=episodes_by_show.get(str(show.ratingKey), (set(), {})) if episodes_by_show is not None else None)
+                       for show in shows]
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    app.logger.error(f"Error scanning show: {e}", exc_info=True)
+                    mark_show_processed()
+                if SCAN_STATUS['stop_requested']:
+                    app.logger.debug("Scan stop requested. Cancelling pending shows.")
+                    break
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        if SCAN_STATUS['stop_requested']:
+            set_scan_status(status_message='Scan stopped by user.')
+            state = 'stopped'
+        else:
+            set_scan_status(status_message='Scan complete.')
+            set_app_state('tv_last_scan', scan_started.strftime('%Y-%m-%d %H:%M:%S'))
+            state = 'completed'
+        OWNED_TITLES.refresh()
         app.logger.debug("TV show scan finished.")
 
     except Exception as e:
-        SCAN_STATUS['status_message'] = f'Error during scan: {e}'
+        set_scan_status(status_message=f'Error during scan: {e}')
         app.logger.error(f"Exception in run_scan_thread: {e}", exc_info=True)
     finally:
-        SCAN_STATUS['in_progress'] = False
-        SCAN_STATUS['stop_requested'] = False
+        set_scan_status(in_progress=False, stop_requested=False)
         app.logger.debug("SCAN_STATUS['in_progress'] set to False.")
+    return state
+
+def set_movie_scan_status(**updates):
+    with MOVIE_SCAN_STATUS_LOCK:
+        MOVIE_SCAN_STATUS.update(updates)
+
+def get_movie_scan_status():
+    """Consistent copy of MOVIE_SCAN_STATUS"""
+    with MOVIE_SCAN_STATUS_LOCK:
+        status = dict(MOVIE_SCAN_STATUS)
+        status['phases'] = {phase: dict(counts) for phase, counts in MOVIE_SCAN_STATUS['phases'].items()}
+        return status
+
+def start_movie_scan_phase(phase, total, message):
+    with MOVIE_SCAN_STATUS_LOCK:
+        MOVIE_SCAN_STATUS['phase'] = phase
+        MOVIE_SCAN_STATUS['phases'][phase] = {'total': total, 'processed': 0}
+        MOVIE_SCAN_STATUS['total_collections'] = total
+        MOVIE_SCAN_STATUS['processed_collections'] = 0
+        MOVIE_SCAN_STATUS['progress'] = 0 if total else 100
+        MOVIE_SCAN_STATUS['status_message'] = message
+
+def mark_movie_scan_item_processed(phase, current):
+    with MOVIE_SCAN_STATUS_LOCK:
+        counts = MOVIE_SCAN_STATUS['phases'][phase]
+        counts['processed'] += 1
+        MOVIE_SCAN_STATUS['current_collection'] = current
+        MOVIE_SCAN_STATUS['processed_collections'] = counts['processed']
+        MOVIE_SCAN_STATUS['progress'] = (counts['processed'] / counts['total']) * 100
+
+def resolve_movie(movie, tmdb_id):
+    """Phase one of the movie scan: details for one Plex movie"""
+    if MOVIE_SCAN_STATUS['stop_requested']:
+        return None, None
+    details = get_movie_details(tmdb_id) if tmdb_id else None
+    mark_movie_scan_item_processed('details', movie.title)
+    return tmdb_id, details
+
+def fetch_collection(collection_tmdb_id):
+    """Phase two of the movie scan: one TMDb collection with all of its parts"""
+    if MOVIE_SCAN_STATUS['stop_requested']:
+        return None
+    try:
+        return tmdb_get(f'collection/{collection_tmdb_id}')
+    except requests.exceptions.RequestException as e:
+        app.logger.error(f"Error fetching TMDB collection details for collection {collection_tmdb_id}: {e}")
+        return None
 
-def run_movie_scan_thread():
-    global MOVIE_SCAN_STATUS
+def run_movie_scan_thread(job_id=None):
+    """Scan the Plex movie library. Returns the final job state.
+
+    Results are only swapped in at the very end, so an interrupted movie
+    scan has nothing to checkpoint and a resumed job starts over.
+    """
+    state = 'failed'
     try:
-        MOVIE_SCAN_STATUS['in_progress'] = True
-        MOVIE_SCAN_STATUS['progress'] = 0
-        MOVIE_SCAN_STATUS['status_message'] = 'Connecting to Plex server...'
-        MOVIE_SCAN_STATUS['start_time'] = datetime.now()
-        MOVIE_SCAN_STATUS['stop_requested'] = False
+        set_movie_scan_status(in_progress=True, progress=0, status_message='Connecting to Plex server...', start_time=datetime.now(),
+                              stop_requested=False, phase='', phases={})
 
-        plex = PlexServer(CONFIG['plex']['url'], CONFIG['plex']['token'])
+        plex = get_plex_server()
         movie_section = plex.library.section(CONFIG['plex']['movie_library_section'])
         
-        MOVIE_SCAN_STATUS['status_message'] = 'Fetching all movies from Plex...'
+        set_movie_scan_status(status_message='Fetching all movies from Plex...')
         all_plex_movies = movie_section.all()
-        
-        plex_movie_tmdb_ids = {get_movie_tmdb_id(m) for m in all_plex_movies if get_movie_tmdb_id(m)}
 
-        # Clear old movie and collection data
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM movies")
-        cursor.execute("DELETE FROM missing_movies")
-        cursor.execute("DELETE FROM collections")
-        conn.commit()
-        conn.close()
-
-        processed_collection_tmdb_ids = set()
-        
-        MOVIE_SCAN_STATUS['total_collections'] = len(all_plex_movies)
-        MOVIE_SCAN_STATUS['processed_collections'] = 0
-
-        for movie in all_plex_movies:
+        workers = max(1, int(CONFIG.get('scan', {}).get('movie_workers', 8)))
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='movie-scan')
+        try:
+            # Phase 1: map every movie to a TMDb id in one pass, then fetch details concurrently
+            set_movie_scan_status(status_message='Phase 1/2: Matching movies to TMDb...')
+            tmdb_ids = resolve_movie_tmdb_ids(all_plex_movies, executor)
+            if MOVIE_SCAN_STATUS['stop_requested']:
+                set_movie_scan_status(status_message='Movie scan stopped by user.')
+                return 'stopped'
+            start_movie_scan_phase('details', len(all_plex_movies), 'Phase 1/2: Resolving movie details...')
+            resolved = list(executor.map(resolve_movie, all_plex_movies, [tmdb_ids.get(str(movie.ratingKey)) for movie in all_plex_movies]))
             if MOVIE_SCAN_STATUS['stop_requested']:
-                MOVIE_SCAN_STATUS['status_message'] = 'Movie scan stopped by user.'
-                break
+                set_movie_scan_status(status_message='Movie scan stopped by user.')
+                return 'stopped'
+
+            plex_movie_tmdb_ids = {tmdb_id for tmdb_id, details in resolved if tmdb_id}
+
+            # Build the complete result in memory; the tables are only touched once it's finished
+            movies = []
+            collections = []
+            missing_movies = []
+            failed_movie_tmdb_ids = set()
+            failed_collection_tmdb_ids = set()
+
+            # Group movies by collection; movies outside a collection get a single movie collection
+            collection_tmdb_ids = []
+            for tmdb_id, details in resolved:
+                if not details:
+                    if tmdb_id:
+                        failed_movie_tmdb_ids.add(tmdb_id)
+                    continue
+                collection_info = details.get('belongs_to_collection')
+                collection_tmdb_id = str(collection_info['id']) if collection_info else None
+                movies.append((
+                    details['title'],
+                    tmdb_id,
+                    details['poster_path'],
+                    details['overview'],
+                    details['release_date'],
+                    details['studio'],
+                    collection_tmdb_id
+                ))
+                if not collection_info:
+                    collections.append((details['title'], f"movie_{tmdb_id}", details['poster_path']))
+                elif collection_tmdb_id not in collection_tmdb_ids:
+                    collection_tmdb_ids.append(collection_tmdb_id)
+
+            # Phase 2: fetch every unique collection exactly once, concurrently
+            start_movie_scan_phase('collections', len(collection_tmdb_ids), 'Phase 2/2: Fetching collections...')
+            futures = {executor.submit(fetch_collection, collection_tmdb_id): collection_tmdb_id for collection_tmdb_id in collection_tmdb_ids}
+            for future in as_completed(futures):
+                collection_tmdb_id = futures[future]
+                collection_data = future.result()
+                if collection_data:
+                    collections.append((collection_data['name'], collection_tmdb_id, f"https://image.tmdb.org/t/p/w500{collection_data.get('poster_path')}"))
+
+                    # Get movies from TMDB collection and find missing ones
+                    for movie_part in collection_data.get('parts', []):
+                        part_tmdb_id = str(movie_part['id'])
+                        if part_tmdb_id not in plex_movie_tmdb_ids:
+                            missing_movies.append((collection_tmdb_id, movie_part['title'], part_tmdb_id, f"https://image.tmdb.org/t/p/w500{movie_part.get('poster_path')}", movie_part.get('release_date')))
+                else:
+                    failed_collection_tmdb_ids.add(collection_tmdb_id)
+                mark_movie_scan_item_processed('collections', collection_data['name'] if collection_data else collection_tmdb_id)
+                if MOVIE_SCAN_STATUS['stop_requested']:
+                    set_movie_scan_status(status_message='Movie scan stopped by user.')
+                    return 'stopped'
+
+            # Swap the new result in atomically; readers see either the old or the new library, never a partial one
+            set_movie_scan_status(status_message='Saving results...')
+            with ScanWriter() as writer:
+                changed = writer.sync_movie_library(movies, collections, missing_movies, failed_movie_tmdb_ids, failed_collection_tmdb_ids)
+            app.logger.info(f"Movie scan wrote {changed} changed rows.")
+            OWNED_TITLES.refresh()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        set_movie_scan_status(status_message='Movie scan complete.')
+        state = 'completed'
 
-            MOVIE_SCAN_STATUS['current_collection'] = movie.title
-            
-            tmdb_id = get_movie_tmdb_id(movie)
-            if not tmdb_id:
-                MOVIE_SCAN_STATUS['processed_collections'] += 1
-                MOVIE_SCAN_STATUS['progress'] = (MOVIE_SCAN_STATUS['processed_collections'] / MOVIE_SCAN_STATUS['total_collections']) * 100
-                continue
+    except Exception as e:
+        set_movie_scan_status(status_message=f'Error during movie scan: {e}')
+        app.logger.error(f"Exception in run_movie_scan_thread: {e}", exc_info=True)
+    finally:
+        set_movie_scan_status(in_progress=False, stop_requested=False)
+    return state
+
+# === SCAN JOBS ===
+class ScanJobManager:
+    """Runs TV and movie scans as jobs persisted in SQLite, one at a time per kind.
+
+    A request that arrives while a scan of the same kind is running is
+    queued; further requests are folded into that queued job (a full scan
+    wins over an incremental one). Jobs left 'running' by a restart are put
+    back in the queue by resume_interrupted() and continue from their
+    checkpoints.
+    """
+
+    def __init__(self, runners):
+        self.runners = runners
+        self._lock = threading.Lock()
+        self._workers = {}
+        self._queued = {kind: 0 for kind in runners}
+
+    def submit(self, kind, mode, trigger):
+        """Queue a scan; returns (job_id, coalesced)"""
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        with self._lock:
+            conn = get_db_connection()
+            queued = conn.execute("SELECT id, mode FROM scan_jobs WHERE kind = ? AND state = 'queued' ORDER BY id LIMIT 1", (kind,)).fetchone()
+            if queued:
+                job_id = queued['id']
+                if mode == 'full' and queued['mode'] != 'full':
+                    conn.execute("UPDATE scan_jobs SET mode = 'full' WHERE id = ?", (job_id,))
+            else:
+                cursor = conn.execute("INSERT INTO scan_jobs (kind, mode, state, trigger, created_at) VALUES (?, ?, 'queued', ?, ?)",
+                                      (kind, mode, trigger, now))
+                job_id = cursor.lastrowid
+            conn.commit()
+            conn.close()
+            self._refresh_queued(kind)
+            self._ensure_worker(kind)
+        if queued:
+            app.logger.info(f"{trigger.capitalize()} {kind} scan request folded into queued job {job_id}.")
+        return job_id, bool(queued)
+
+    def resume_interrupted(self):
+        """Requeue jobs that were running when the process stopped, then start their workers"""
+        with self._lock:
+            conn = get_db_connection()
+            interrupted = conn.execute("SELECT id, kind FROM scan_jobs WHERE state = 'running'").fetchall()
+            conn.execute("UPDATE scan_jobs SET state = 'queued' WHERE state = 'running'")
+            conn.commit()
+            kinds = {row['kind'] for row in conn.execute("SELECT DISTINCT kind FROM scan_jobs WHERE state = 'queued'")}
+            conn.close()
+            for row in interrupted:
+                app.logger.info(f"Resuming interrupted {row['kind']} scan job {row['id']}.")
+            for kind in kinds & set(self.runners):
+                self._refresh_queued(kind)
+                self._ensure_worker(kind)
 
-            details = get_movie_details(tmdb_id)
-            if not details:
-                MOVIE_SCAN_STATUS['processed_collections'] += 1
-                MOVIE_SCAN_STATUS['progress'] = (MOVIE_SCAN_STATUS['processed_collections'] / MOVIE_SCAN_STATUS['total_collections']) * 100
-                continue
+    def checkpoints(self, job_id):
+        conn = get_db_connection()
+        items = {row['item'] for row in conn.execute("SELECT item FROM scan_job_checkpoints WHERE job_id = ?", (job_id,))}
+        conn.close()
+        return items
 
-            collection_info = details.get('belongs_to_collection')
-            collection_tmdb_id = str(collection_info['id']) if collection_info else None
-            
-            insert_movie(
-                details['title'],
-                tmdb_id,
-                details['poster_path'],
-                details['overview'],
-                details['release_date'],
-                details['studio'],
-                collection_tmdb_id
-            )
-
-            if not collection_info:
-                # This movie is not in a collection. Create a single movie collection.
-                insert_collection(details['title'], f"movie_{tmdb_id}", details['poster_path'])
-                MOVIE_SCAN_STATUS['processed_collections'] += 1
-                MOVIE_SCAN_STATUS['progress'] = (MOVIE_SCAN_STATUS['processed_collections'] / MOVIE_SCAN_STATUS['total_collections']) * 100
-                continue
+    def queued(self, kind):
+        with self._lock:
+            return self._queued.get(kind, 0)
 
-            collection_tmdb_id = str(collection_info['id'])
+    def recent(self, limit=20):
+        conn = get_db_connection()
+        jobs = [dict(row) for row in conn.execute("SELECT * FROM scan_jobs ORDER BY id DESC LIMIT ?", (limit,))]
+        conn.close()
+        return jobs
 
-            if collection_tmdb_id in processed_collection_tmdb_ids:
-                MOVIE_SCAN_STATUS['processed_collections'] += 1
-                MOVIE_SCAN_STATUS['progress'] = (MOVIE_SCAN_STATUS['processed_collections'] / MOVIE_SCAN_STATUS['total_collections']) * 100
-                continue
+    def _refresh_queued(self, kind):
+        # Called with the lock held
+        conn = get_db_connection()
+        self._queued[kind] = conn.execute("SELECT COUNT(*) FROM scan_jobs WHERE kind = ? AND state = 'queued'", (kind,)).fetchone()[0]
+        conn.close()
 
-            # Fetch collection details from TMDB
-            collection_url = get_api_url('tmdb', f'collection/{collection_tmdb_id}')
-            if not collection_url: continue
-            
+    def _ensure_worker(self, kind):
+        # Called with the lock held
+        worker = self._workers.get(kind)
+        if worker is None or not worker.is_alive():
+            worker = threading.Thread(target=self._run_worker, args=(kind,), daemon=True, name=f'{kind}-scan-jobs')
+            self._workers[kind] = worker
+            worker.start()
+
+    def _run_worker(self, kind):
+        while True:
+            with self._lock:
+                conn = get_db_connection()
+                job = conn.execute("SELECT * FROM scan_jobs WHERE kind = ? AND state = 'queued' ORDER BY id LIMIT 1", (kind,)).fetchone()
+                if job is None:
+                    conn.close()
+                    self._workers.pop(kind, None)
+                    return
+                conn.execute("UPDATE scan_jobs SET state = 'running', started_at = ? WHERE id = ?",
+                             (datetime.now().strftime('%Y-%m-%d %H:%M:%S'), job['id']))
+                conn.commit()
+                conn.close()
+                self._refresh_queued(kind)
+
+            app.logger.info(f"Starting {job['trigger']} {kind} scan job {job['id']} ({job['mode']}).")
+            error = None
             try:
-                r = requests.get(collection_url)
-                r.raise_for_status()
-                collection_data = r.json()
-                
-                collection_id = insert_collection(collection_data['name'], collection_tmdb_id, f"https://image.tmdb.org/t/p/w500{collection_data.get('poster_path')}")
-
-                # Get movies from TMDB collection and find missing ones
-                for movie_part in collection_data.get('parts', []):
-                    part_tmdb_id = str(movie_part['id'])
-                    if part_tmdb_id not in plex_movie_tmdb_ids:
-                        insert_missing_movie(collection_id, movie_part['title'], part_tmdb_id, f"https://image.tmdb.org/t/p/w500{movie_part.get('poster_path')}", movie_part.get('release_date'))
-                
-                processed_collection_tmdb_ids.add(collection_tmdb_id)
-
-            except requests.exceptions.RequestException as e:
-                app.logger.error(f"Error fetching TMDB collection details for {collection_data.get('name')}: {e}")
+                state = self.runners[kind](job)
+            except Exception as e:
+                app.logger.error(f"Scan job {job['id']} failed: {e}", exc_info=True)
+                state, error = 'failed', str(e)
 
-            MOVIE_SCAN_STATUS['processed_collections'] += 1
-            MOVIE_SCAN_STATUS['progress'] = (MOVIE_SCAN_STATUS['processed_collections'] / MOVIE_SCAN_STATUS['total_collections']) * 100
-            time.sleep(random.uniform(0.2, 0.5))
-
-        MOVIE_SCAN_STATUS['status_message'] = 'Movie scan complete.'
+            status = get_scan_status() if kind == 'tv' else get_movie_scan_status()
+            processed, total = (status['processed_shows'], status['total_shows']) if kind == 'tv' else (status['processed_collections'], status['total_collections'])
+            conn = get_db_connection()
+            conn.execute("UPDATE scan_jobs SET state = ?, finished_at = ?, processed = ?, total = ?, error = ? WHERE id = ?",
+                         (state, datetime.now().strftime('%Y-%m-%d %H:%M:%S'), processed, total, error or (status['status_message'] if state == 'failed' else None), job['id']))
+            # Checkpoints are only needed while a job can still be resumed
+            conn.execute("DELETE FROM scan_job_checkpoints WHERE job_id = ?", (job['id'],))
+            conn.commit()
+            conn.close()
 
-    except Exception as e:
-        MOVIE_SCAN_STATUS['status_message'] = f'Error during movie scan: {e}'
-        app.logger.error(f"Exception in run_movie_scan_thread: {e}", exc_info=True)
-    finally:
-        MOVIE_SCAN_STATUS['in_progress'] = False
-        MOVIE_SCAN_STATUS['stop_requested'] = False
+SCAN_JOBS = ScanJobManager({
+    'tv': lambda job: run_scan_thread(mode=job['mode'], job_id=job['id']),
+    'movie': lambda job: run_movie_scan_thread(job_id=job['id'])
+})
 
 # Initialize scheduler
 scheduler = BackgroundScheduler(daemon=True)
 
 def schedule_tv_scan():
-    # This function will be called by the scheduler
-    global SCAN_STATUS
-    if not SCAN_STATUS['in_progress']:
-        app.logger.info("Starting scheduled TV show scan.")
-        run_scan_thread()
-    else:
-        app.logger.info("Skipping scheduled TV show scan as one is already in progress.")
+    # Called by the scheduler; the job manager runs it (or folds it into an already queued scan)
+    app.logger.info("Queueing scheduled TV show scan.")
+    SCAN_JOBS.submit('tv', 'incremental', 'scheduled')
 
 def schedule_movie_scan():
-    global MOVIE_SCAN_STATUS
-    if not MOVIE_SCAN_STATUS['in_progress']:
-        app.logger.info("Starting scheduled movie scan.")
-        run_movie_scan_thread()
-    else:
-        app.logger.info("Skipping scheduled movie scan as one is already in progress.")
+    app.logger.info("Queueing scheduled movie scan.")
+    SCAN_JOBS.submit('movie', 'full', 'scheduled')
 
 def update_scheduled_jobs():
     scheduler.remove_all_jobs()
@@ -795,182 +1931,780 @@ def update_scheduled_jobs():
         scheduler.add_job(schedule_movie_scan, 'interval', hours=interval, id='movie_scan_job')
         app.logger.info(f"Scheduled movie scan to run every {interval} hours.")
 
+# === TARGETED RESCANS ===
+# Refresh a single show or collection through the same fetch and upsert path
+# as the library scans, without touching the scan status or the job queue.
+# Finished qBittorrent downloads trigger one automatically.
+RESCAN_DELAY = CONFIG.get('qbittorrent', {}).get('rescan_delay_seconds', 60)
+
+def find_plex_show(title=None, tmdb_id=None):
+    section = get_plex_server().library.section(CONFIG['plex']['library_section'])
+    if not title:
+        row = get_tv_show_by_tmdb_id(str(tmdb_id))
+        if not row:
+            try:
+                return section.getGuid(f'tmdb://{tmdb_id}')
+            except NotFound:
+                return None
+        title = row['title']
+    try:
+        return section.get(title)
+    except NotFound:
+        return None
+
+def rescan_show(title=None, tmdb_id=None):
+    """Rescan one show by Plex title or TMDb id. Returns its tv_shows row, or None if Plex doesn't have it.
+
+    Only the Plex side has changed when this runs, so the show is compared
+    against cached TMDb responses; their freshness is up to the cache TTLs,
+    revalidation and the change feed.
+    """
+    show = find_plex_show(title, tmdb_id)
+    if show is None:
+        return None
+    scan_show(show, progress=False)
+    OWNED_TITLES.refresh()
+    return get_tv_show_by_title(show.title)
+
+def plex_has_movie(movie_section, title, tmdb_id):
+    return any(get_movie_tmdb_id(movie) == tmdb_id for movie in movie_section.search(title=title))
+
+def rescan_collection(collection_tmdb_id):
+    """Rescan one TMDb collection, or a 'movie_<id>' single-movie entry.
+
+    Only Plex ownership changes here, so the collection comes from the TMDb
+    cache when it is fresh, and only the parts that aren't in the movies
+    table yet are looked up in Plex (one search per missing part). Returns
+    the number of rows written, or None if TMDb doesn't know the collection.
+    """
+    collection_tmdb_id = str(collection_tmdb_id)
+    movies = []
+    missing_movies = []
+    if collection_tmdb_id.startswith('movie_'):
+        tmdb_id = collection_tmdb_id[len('movie_'):]
+        details = get_movie_details(tmdb_id)
+        if not details:
+            return None
+        movies.append((details['title'], tmdb_id, details['poster_path'], details['overview'], details['release_date'], details['studio'], None))
+        collection = (details['title'], collection_tmdb_id, details['poster_path'])
+    else:
+        try:
+            collection_data = tmdb_get(f'collection/{collection_tmdb_id}')
+        except requests.exceptions.RequestException as e:
+            app.logger.error(f"Error fetching TMDB collection details for collection {collection_tmdb_id}: {e}")
+            return None
+        if not collection_data:
+            return None
+        collection = (collection_data['name'], collection_tmdb_id, f"https://image.tmdb.org/t/p/w500{collection_data.get('poster_path')}")
+
+        conn = get_db_connection()
+        owned = {row['tmdb_id'] for row in conn.execute("SELECT tmdb_id FROM movies")}
+        conn.close()
+        movie_section = get_plex_server().library.section(CONFIG['plex']['movie_library_section'])
+        for movie_part in collection_data.get('parts', []):
+            part_tmdb_id = str(movie_part['id'])
+            if part_tmdb_id in owned:
+                continue
+            details = get_movie_details(part_tmdb_id) if plex_has_movie(movie_section, movie_part['title'], part_tmdb_id) else None
+            if details:
+                movies.append((details['title'], part_tmdb_id, details['poster_path'], details['overview'], details['release_date'], details['studio'], collection_tmdb_id))
+            else:
+                missing_movies.append((collection_tmdb_id, movie_part['title'], part_tmdb_id, f"https://image.tmdb.org/t/p/w500{movie_part.get('poster_path')}", movie_part.get('release_date')))
+
+    with ScanWriter() as writer:
+        changed = writer.sync_collection(collection, movies, missing_movies)
+    OWNED_TITLES.refresh()
+    return changed
+
+def find_download_target(torrent):
+    """Map a finished torrent to ('tv', show title), ('movie', collection tmdb id) or ('plex_movie', Plex rating key).
+
+    Movies are matched against the collections' missing lists first. A movie
+    outside any collection, or in one that hasn't been scanned yet, is looked
+    up in the Plex movie section instead, which by now should have imported it.
+    """
+    mappings = CONFIG['qbittorrent'].get('category_mappings', {})
+    candidates = release_title_candidates(torrent.get('name'))
+    conn = get_db_connection()
+    try:
+        if torrent.get('category') == mappings.get('tv'):
+            for row in conn.execute("SELECT title FROM tv_shows"):
+                if normalize_title(row['title']) in candidates:
+                    return 'tv', row['title']
+        elif torrent.get('category') == mappings.get('movies'):
+            for row in conn.execute("SELECT c.tmdb_id, m.title FROM missing_movies m JOIN collections c ON c.id = m.collection_id"):
+                if normalize_title(row['title']) in candidates:
+                    return 'movie', row['tmdb_id']
+            movie = find_plex_movie(candidates)
+            if movie is not None:
+                return 'plex_movie', str(movie.ratingKey)
+    finally:
+        conn.close()
+    return None
+
+def find_plex_movie(candidates):
+    """The Plex movie whose title matches one of a release's title candidates, shortest candidate first"""
+    movie_section = get_plex_server().library.section(CONFIG['plex']['movie_library_section'])
+    for candidate in sorted(candidates, key=len):
+        for movie in movie_section.search(title=candidate):
+            if normalize_title(movie.title) in candidates:
+                return movie
+    return None
+
+def rescan_completed_download(torrent):
+    try:
+        target = find_download_target(torrent)
+        if target is None:
+            app.logger.debug(f"No show or collection matches finished download {torrent.get('name')}, leaving it to the next scan.")
+            return
+        kind, key = target
+        app.logger.info(f"Download {torrent.get('name')} finished, rescanning {kind} {key}.")
+        if kind == 'tv':
+            rescan_show(title=key)
+        elif kind == 'plex_movie':
+            # Same path as a Plex library.new webhook
+            update_movie(key)
+        else:
+            rescan_collection(key)
+    except Exception as e:
+        app.logger.error(f"Error rescanning after download {torrent.get('name')}: {e}", exc_info=True)
+
+def schedule_download_rescan(torrent):
+    # Give Plex time to pick the new files up before we look
+    timer = threading.Timer(RESCAN_DELAY, rescan_completed_download, args=(torrent,))
+    timer.daemon = True
+    timer.start()
+
+# === PLEX LIBRARY EVENTS ===
+# Plex webhooks, and optionally the server's notification websocket, turn
+# library changes into targeted updates within seconds, so the scheduled
+# full scans can run rarely. A season pack imports one episode at a time;
+# all events for the same show or movie within the delay collapse into one update.
+LIBRARY_EVENTS = ('library.new', 'media.deleted')
+LIBRARY_EVENT_DELAY = CONFIG['plex'].get('event_delay_seconds', 10)
+PENDING_LIBRARY_UPDATES = set()
+PENDING_LIBRARY_UPDATES_LOCK = threading.Lock()
+# TV timeline items from the Plex websocket waiting for the next 'tv_items' update: {rating key: show title or None}
+PENDING_PLEX_TV_ITEMS = {}
+# Timeline notification item types and states sent over the Plex websocket
+PLEX_TIMELINE_TYPES = {1: 'movie', 2: 'show', 3: 'season', 4: 'episode'}
+PLEX_TIMELINE_PROCESSED = 5
+PLEX_TIMELINE_DELETED = 9
+PLEX_ALERT_LISTENER = None
+PLEX_ALERT_LISTENER_LOCK = threading.Lock()
+
+def queue_library_update(kind, key):
+    """Update one show (kind 'tv', key = Plex title) or movie (kind 'movie', key = (rating key, tmdb id)) once its events settle.
+
+    Kind 'tv_items' (key None) resolves everything in PENDING_PLEX_TV_ITEMS to shows at once.
+    """
+    with PENDING_LIBRARY_UPDATES_LOCK:
+        if (kind, key) in PENDING_LIBRARY_UPDATES:
+            return
+        PENDING_LIBRARY_UPDATES.add((kind, key))
+    timer = threading.Timer(LIBRARY_EVENT_DELAY, apply_library_update, args=(kind, key))
+    timer.daemon = True
+    timer.start()
+
+def apply_library_update(kind, key):
+    # Events arriving from here on queue a fresh update
+    with PENDING_LIBRARY_UPDATES_LOCK:
+        PENDING_LIBRARY_UPDATES.discard((kind, key))
+        if kind == 'tv_items':
+            items = dict(PENDING_PLEX_TV_ITEMS)
+            PENDING_PLEX_TV_ITEMS.clear()
+    try:
+        if kind == 'tv':
+            update_show(key)
+        elif kind == 'tv_items':
+            for title in plex_tv_item_titles(items):
+                apply_library_update('tv', title)
+        else:
+            update_movie(*key)
+    except Exception as e:
+        app.logger.error(f"Error applying Plex library update for {kind} {key}: {e}", exc_info=True)
+
+def plex_tv_item_titles(items):
+    """Show titles for Plex TV items ({rating key: show title if the item is a show, else None}).
+
+    Items a scan has already seen are mapped through plex_tv_items without
+    asking Plex, which also covers deleted ones. The rest (new imports) are
+    fetched together in a single request.
+    """
+    titles = set()
+    unknown = []
+    conn = get_db_connection()
+    for rating_key, title in items.items():
+        row = conn.execute("""
+            SELECT t.title FROM plex_tv_items p JOIN tv_shows t ON t.id = p.tv_show_id WHERE p.rating_key = ?
+        """, (rating_key,)).fetchone()
+        if row:
+            titles.add(row['title'])
+        elif title:
+            titles.add(title)
+        else:
+            unknown.append(rating_key)
+    conn.close()
+    if unknown:
+        try:
+            container = get_plex_server().query(f"/library/metadata/{','.join(unknown)}")
+        except NotFound:
+            container = []
+        field = {'show': 'title', 'season': 'parentTitle', 'episode': 'grandparentTitle'}
+        for element in container:
+            title = element.get(field.get(element.get('type'), ''))
+            if title:
+                titles.add(title)
+        if len(container) < len(unknown):
+            app.logger.debug(f"{len(unknown) - len(container)} Plex items are unknown and gone from Plex; leaving them to the next scan.")
+    return titles
+
+def update_show(title):
+    if IGNORED_SHOWS.is_ignored(title):
+        return
+    if rescan_show(title=title) is None:
+        app.logger.info(f"{title} is no longer in Plex, removing it.")
+        delete_tv_shows([title])
+        OWNED_TITLES.refresh()
+
+def update_movie(rating_key, tmdb_id=None):
+    try:
+        movie = get_plex_server().fetchItem(int(rating_key))
+    except NotFound:
+        movie = None
+    if movie is None:
+        if not tmdb_id:
+            conn = get_db_connection()
+            row = conn.execute("SELECT tmdb_id FROM plex_movie_ids WHERE rating_key = ?", (str(rating_key),)).fetchone()
+            conn.close()
+            tmdb_id = row['tmdb_id'] if row else None
+        if not tmdb_id:
+            app.logger.debug(f"Deleted Plex item {rating_key} has no TMDb id, leaving it to the next movie scan.")
+            return
+        collection_tmdb_id = delete_movie(tmdb_id)
+        if collection_tmdb_id:
+            # Puts the movie back on the collection's missing list
+            rescan_collection(collection_tmdb_id)
+        OWNED_TITLES.refresh()
+        return
+
+    tmdb_id = get_movie_tmdb_id(movie)
+    if not tmdb_id:
+        return
+    details = get_movie_details(tmdb_id)
+    if not details:
+        return
+    collection_info = details.get('belongs_to_collection')
+    if not collection_info:
+        rescan_collection(f'movie_{tmdb_id}')
+        return
+    collection_tmdb_id = str(collection_info['id'])
+    insert_movie(details['title'], tmdb_id, details['poster_path'], details['overview'], details['release_date'], details['studio'], collection_tmdb_id)
+    rescan_collection(collection_tmdb_id)
+
+def handle_library_event(event, metadata):
+    """Queue the update for a Plex webhook event; returns whether the event concerned one of our libraries"""
+    if event not in LIBRARY_EVENTS:
+        return False
+    section = metadata.get('librarySectionTitle')
+    item_type = metadata.get('type')
+    if section == CONFIG['plex']['library_section'] and item_type in ('show', 'season', 'episode'):
+        title = {'show': metadata.get('title'), 'season': metadata.get('parentTitle'), 'episode': metadata.get('grandparentTitle')}[item_type]
+        queue_library_update('tv', title)
+    elif section == CONFIG['plex']['movie_library_section'] and item_type == 'movie':
+        guids = [guid.get('id', '') for guid in metadata.get('Guid') or []]
+        tmdb_id = next((guid.split('//')[1] for guid in guids if guid.startswith('tmdb://')), None)
+        queue_library_update('movie', (metadata.get('ratingKey'), tmdb_id))
+    else:
+        return False
+    return True
+
+def handle_plex_alert(message, sections):
+    """AlertListener callback; sections maps library section ids to 'tv' or 'movie'"""
+    if message.get('type') != 'timeline':
+        return
+    for entry in message.get('TimelineEntry') or []:
+        kind = sections.get(str(entry.get('sectionID')))
+        item_type = PLEX_TIMELINE_TYPES.get(entry.get('type'))
+        state = entry.get('state')
+        if kind is None or item_type is None or state not in (PLEX_TIMELINE_PROCESSED, PLEX_TIMELINE_DELETED):
+            continue
+        if kind == 'movie' and item_type == 'movie':
+            # Deletions carry no TMDb id; update_movie looks it up by rating key
+            queue_library_update('movie', (str(entry['itemID']), None))
+        elif kind == 'tv' and item_type in ('show', 'season', 'episode'):
+            # Shows, seasons and episodes, added or deleted, are resolved to their show in one batch
+            # once the events settle, instead of one Plex lookup per entry on this thread
+            with PENDING_LIBRARY_UPDATES_LOCK:
+                PENDING_PLEX_TV_ITEMS[str(entry['itemID'])] = entry.get('title') if item_type == 'show' else None
+            queue_library_update('tv_items', None)
+
+def run_plex_alert_listener():
+    while True:
+        try:
+            plex = get_plex_server()
+            sections = {
+                str(plex.library.section(CONFIG['plex']['library_section']).key): 'tv',
+                str(plex.library.section(CONFIG['plex']['movie_library_section']).key): 'movie'
+            }
+            listener = plex.startAlertListener(
+                lambda message: handle_plex_alert(message, sections),
+                callbackError=lambda e: app.logger.error(f"Plex alert listener error: {e}"))
+            app.logger.info("Listening for Plex library notifications.")
+            listener.join()
+        except Exception as e:
+            app.logger.error(f"Error in Plex alert listener: {e}", exc_info=True)
+        # The websocket dropped (Plex restarted, network blip); reconnect after a pause
+        time.sleep(30)
+
+def ensure_plex_alert_listener():
+    global PLEX_ALERT_LISTENER
+    if not CONFIG['plex'].get('alert_listener', False):
+        return
+    try:
+        import websocket
+    except ImportError:
+        app.logger.error("plex.alert_listener needs the websocket-client package; relying on webhooks and scheduled scans.")
+        return
+    with PLEX_ALERT_LISTENER_LOCK:
+        if PLEX_ALERT_LISTENER is None or not PLEX_ALERT_LISTENER.is_alive():
+            PLEX_ALERT_LISTENER = threading.Thread(target=run_plex_alert_listener, daemon=True, name='plex-alert-listener')
+            PLEX_ALERT_LISTENER.start()
+
+# === DOWNLOADS POLLER ===
+# One background poller keeps the qBittorrent snapshot fresh for every open
+# Downloads page and pushes per-torrent deltas to them over SSE.
+DOWNLOADS_CHANNEL = 'downloads'
+DOWNLOAD_FIELDS = ('name', 'size', 'progress', 'state', 'dlspeed', 'upspeed', 'eta')
+DOWNLOADS_POLL_INTERVAL = CONFIG.get('qbittorrent', {}).get('poll_interval_seconds', 2)
+# With nobody watching the interval doubles up to this
+DOWNLOADS_IDLE_INTERVAL = CONFIG.get('qbittorrent', {}).get('idle_poll_interval_seconds', 60)
+DOWNLOADS_POLLER = None
+DOWNLOADS_POLLER_LOCK = threading.Lock()
+
+def download_fields(torrent):
+    return {field: torrent[field] for field in DOWNLOAD_FIELDS if field in torrent}
+
+def publish_downloads_delta(changed, removed):
+    """Push a sync delta to every Downloads tab; runs for every sync, the poller's or a request thread's"""
+    changed = {torrent_hash: download_fields(fields) for torrent_hash, fields in changed.items()}
+    changed = {torrent_hash: fields for torrent_hash, fields in changed.items() if fields}
+    if changed or removed:
+        EVENTS.publish(DOWNLOADS_CHANNEL, 'delta', {'changed': changed, 'removed': removed})
+
+def downloads_snapshot(max_age=0):
+    torrents = get_qbittorrent().get_torrents(max_age)
+    return {torrent_hash: download_fields(torrent) for torrent_hash, torrent in torrents.items()}
+
+def run_downloads_poller():
+    interval = DOWNLOADS_POLL_INTERVAL
+    client = None
+    failed = False
+    while True:
+        try:
+            qbt = get_qbittorrent()
+            if qbt is not client or failed:
+                # New connection settings or recovering from an error: send everything again
+                client = qbt
+                EVENTS.publish(DOWNLOADS_CHANNEL, 'snapshot', downloads_snapshot())
+            else:
+                # The delta is published by publish_downloads_delta
+                qbt.sync()
+            for torrent in qbt.pop_completed():
+                schedule_download_rescan(torrent)
+            failed = False
+        except Exception as e:
+            app.logger.error(f"Error polling qBittorrent: {e}")
+            EVENTS.publish(DOWNLOADS_CHANNEL, 'error', {'error': 'Could not connect to qBittorrent.'})
+            failed = True
+
+        watched = EVENTS.subscribers(DOWNLOADS_CHANNEL) > 0
+        if watched and not failed:
+            interval = DOWNLOADS_POLL_INTERVAL
+        else:
+            interval = min(DOWNLOADS_IDLE_INTERVAL, interval * 2)
+        if watched:
+            time.sleep(interval)
+        else:
+            # A new subscriber cuts the idle wait short
+            EVENTS.wait_for_subscriber(DOWNLOADS_CHANNEL, interval)
+
+def ensure_downloads_poller():
+    global DOWNLOADS_POLLER
+    with DOWNLOADS_POLLER_LOCK:
+        if DOWNLOADS_POLLER is None or not DOWNLOADS_POLLER.is_alive():
+            DOWNLOADS_POLLER = threading.Thread(target=run_downloads_poller, daemon=True, name='downloads-poller')
+            DOWNLOADS_POLLER.start()
+
+# === SCAN PROGRESS STREAM ===
+# Status changes are sampled and coalesced to at most one event per
+# SCAN_STREAM_INTERVAL, and finished shows are batched into the same tick.
+SCAN_STREAM_INTERVAL = 0.25
+SCAN_STREAM_CHANNELS = {'tv': 'scan_tv', 'movie': 'scan_movie'}
+SCAN_COMPLETED_SHOWS = deque(maxlen=1000)
+SCAN_PUBLISHERS = {}
+SCAN_PUBLISHERS_LOCK = threading.Lock()
+
+def tv_scan_status_payload():
+    status = get_scan_status()
+    elapsed_time = None
+    if status['start_time']:
+        elapsed = datetime.now() - status['start_time']
+        elapsed_time = str(elapsed).split('.')[0]
+        
+    return {
+        'in_progress': status['in_progress'],
+        'progress': status['progress'],
+        'current_show': status['current_show'],
+        'total_shows': status['total_shows'],
+        'processed_shows': status['processed_shows'],
+        'status_message': status['status_message'],
+        'elapsed_time': elapsed_time,
+        'stop_requested': status['stop_requested'],
+        'mode': status['mode'],
+        'queued': SCAN_JOBS.queued('tv'),
+        'http_requests': status['http_requests'],
+        'last_show_http_requests': status['last_show_http_requests'],
+        'avg_http_requests_per_show': status['http_requests'] / status['processed_shows'] if status['processed_shows'] else 0
+    }
+
+def movie_scan_status_payload():
+    status = get_movie_scan_status()
+    elapsed_time = None
+    if status['start_time']:
+        elapsed = datetime.now() - status['start_time']
+        elapsed_time = str(elapsed).split('.')[0]
+        
+    return {
+        'in_progress': status['in_progress'],
+        'progress': status['progress'],
+        'current_collection': status['current_collection'],
+        'total_collections': status['total_collections'],
+        'processed_collections': status['processed_collections'],
+        'status_message': status['status_message'],
+        'elapsed_time': elapsed_time,
+        'stop_requested': status['stop_requested'],
+        'queued': SCAN_JOBS.queued('movie'),
+        'phase': status['phase'],
+        'phases': status['phases']
+    }
+
+def record_show_completed(title, poster_url, status, series_status):
+    # Only buffered while someone is watching; the page reloads from the database otherwise
+    if EVENTS.subscribers(SCAN_STREAM_CHANNELS['tv']):
+        SCAN_COMPLETED_SHOWS.append({'title': title, 'poster_url': poster_url, 'status': status, 'series_status': series_status})
+
+def run_scan_status_publisher(kind):
+    channel = SCAN_STREAM_CHANNELS[kind]
+    status_payload = tv_scan_status_payload if kind == 'tv' else movie_scan_status_payload
+    last = None
+    while True:
+        if not EVENTS.wait_for_subscriber(channel, 60):
+            last = None
+            continue
+        if kind == 'tv':
+            shows = []
+            while SCAN_COMPLETED_SHOWS:
+                shows.append(SCAN_COMPLETED_SHOWS.popleft())
+            if shows:
+                EVENTS.publish(channel, 'shows', shows)
+        payload = status_payload()
+        # elapsed_time ticks every second even when idle, so it only counts as a change mid-scan
+        compare = dict(payload, elapsed_time=None) if not payload['in_progress'] else payload
+        if compare != last:
+            EVENTS.publish(channel, 'status', payload)
+            last = compare
+        time.sleep(SCAN_STREAM_INTERVAL)
+
+def ensure_scan_status_publisher(kind):
+    with SCAN_PUBLISHERS_LOCK:
+        publisher = SCAN_PUBLISHERS.get(kind)
+        if publisher is None or not publisher.is_alive():
+            publisher = threading.Thread(target=run_scan_status_publisher, args=(kind,), daemon=True, name=f'scan-{kind}-publisher')
+            publisher.start()
+            SCAN_PUBLISHERS[kind] = publisher
+
+# === HTTP CACHING ===
+# Pages and API responses are cached per path, query string and data
+# generation, and sent with strong ETags so repeat visits revalidate to a 304.
+# Static files get a content fingerprint in their URL and are cached for a year.
+RESPONSE_CACHE_CONFIG = CONFIG.get('app', {}).get('response_cache', {})
+RESPONSE_CACHE = ResponseCache(max_entries=RESPONSE_CACHE_CONFIG.get('max_entries', 256),
+                               max_bytes=RESPONSE_CACHE_CONFIG.get('max_size_mb', 64) * 1024 * 1024)
+DATA_GENERATION = DataGeneration(DATABASE_PATH)
+COMPRESSIBLE_MIMETYPES = ('text/', 'application/json', 'application/javascript', 'image/svg+xml')
+STATIC_MAX_AGE = 365 * 24 * 3600
+STATIC_FINGERPRINTS = {}
+
+def accepts_gzip():
+    return 'gzip' in request.accept_encodings
+
+def cached_response(view):
+    """Serve a GET view from RESPONSE_CACHE while the library data is unchanged"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        # The date is in the key because aired vs. upcoming episodes depends on it
+        key = (request.path, request.query_string, DATA_GENERATION.current(), datetime.now().strftime('%Y-%m-%d'))
+        entry = RESPONSE_CACHE.get(key)
+        if entry is None:
+            response = app.make_response(view(*args, **kwargs))
+            if response.status_code != 200 or response.is_streamed:
+                return response
+            # Keep an ETag the view chose itself (show details); otherwise one is derived from the body
+            etag, _ = response.get_etag()
+            entry = RESPONSE_CACHE.put(key, response.get_data(), response.content_type, etag)
+
+        use_gzip = entry.gzipped is not None and accepts_gzip()
+        response = Response(entry.gzipped if use_gzip else entry.body, content_type=entry.content_type)
+        # Each encoding is a different representation, so it gets its own strong ETag
+        response.set_etag(f'{entry.etag}-gzip' if use_gzip else entry.etag)
+        if use_gzip:
+            response.headers['Content-Encoding'] = 'gzip'
+        if entry.gzipped is not None:
+            response.vary.add('Accept-Encoding')
+        response.headers['Cache-Control'] = 'no-cache'
+        return response.make_conditional(request)
+    return wrapper
+
+def compress_response(response):
+    if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+            or 'Content-Encoding' in response.headers or not response.mimetype.startswith(COMPRESSIBLE_MIMETYPES)):
+        return response
+    response.vary.add('Accept-Encoding')
+    body = response.get_data()
+    if len(body) < GZIP_MIN_SIZE or not accepts_gzip():
+        return response
+    response.set_data(gzip.compress(body, compresslevel=6))
+    response.headers['Content-Encoding'] = 'gzip'
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag(f'{etag}-gzip', weak)
+    return response
+
+def static_fingerprint(filename):
+    path = os.path.join(app.static_folder, filename)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    cached = STATIC_FINGERPRINTS.get(filename)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    with open(path, 'rb') as f:
+        fingerprint = hashlib.md5(f.read()).hexdigest()[:12]
+    STATIC_FINGERPRINTS[filename] = (mtime, fingerprint)
+    return fingerprint
+
+@app.url_defaults
+def fingerprint_static_urls(endpoint, values):
+    if endpoint == 'static' and 'filename' in values and 'v' not in values:
+        fingerprint = static_fingerprint(values['filename'])
+        if fingerprint:
+            values['v'] = fingerprint
+
+@app.after_request
+def finish_response(response):
+    # A fingerprinted URL changes whenever the file does, so the browser never needs to revalidate it
+    if request.endpoint == 'static' and request.args.get('v') and response.status_code == 200:
+        response.headers['Cache-Control'] = f'public, max-age={STATIC_MAX_AGE}, immutable'
+    return compress_response(response)
+
 # === FLASK ROUTES ===
 @app.route('/')
+@cached_response
 def index():
     conn = get_db_connection()
-    shows = conn.execute('SELECT * FROM tv_shows ORDER BY title').fetchall()
+    shows = conn.execute(f'SELECT title, poster_url, status, series_status FROM tv_shows WHERE {NOT_IGNORED_SHOW} ORDER BY title').fetchall()
+    counts = get_show_counts(conn)
     conn.close()
 
     results = {}
-    total_shows = 0
-    complete_shows = 0
-    incomplete_shows = 0
-    unknown_shows = 0
-    
-    ignored = get_ignored_shows()
-
     for show in shows:
-        if show['title'] in ignored:
-            continue
-        
-        total_shows += 1
-        if show['status'] == 'Complete':
-            complete_shows += 1
-        elif show['status'] == 'Incomplete':
-            incomplete_shows += 1
-        else:
-            unknown_shows += 1
-            
         results[show['title']] = {
             'poster_url': show['poster_url'],
             'status': show['status'],
             'series_status': show['series_status']
         }
 
-    return render_template('index.html', results=results, ignored=ignored, total_shows=total_shows, complete_shows=complete_shows, incomplete_shows=incomplete_shows, unknown_shows=unknown_shows)
+    return render_template('index.html', results=results, total_shows=counts['total'], complete_shows=counts['complete'], incomplete_shows=counts['incomplete'], unknown_shows=counts['unknown'])
 
 @app.route('/scan')
 def scan():
-    global SCAN_STATUS
-    if SCAN_STATUS['in_progress']:
-        return jsonify({'error': 'A scan is already in progress.'}), 400
-    
-    scan_thread = threading.Thread(target=run_scan_thread)
-    scan_thread.start()
-    return jsonify({'success': True})
+    mode = request.args.get('mode', 'incremental')
+    if mode not in ['full', 'incremental']:
+        return jsonify({'error': 'mode must be "full" or "incremental".'}), 400
+    # Queued behind a running scan rather than rejected
+    job_id, coalesced = SCAN_JOBS.submit('tv', mode, 'manual')
+    return jsonify({'success': True, 'job_id': job_id, 'queued': get_scan_status()['in_progress'], 'coalesced': coalesced})
+
+@app.route('/scan_jobs')
+def scan_jobs():
+    return jsonify(SCAN_JOBS.recent())
 
 @app.route('/scan-status')
 def scan_status():
-    global SCAN_STATUS
-    elapsed_time = None
-    if SCAN_STATUS['start_time']:
-        elapsed = datetime.now() - SCAN_STATUS['start_time']
-        elapsed_time = str(elapsed).split('.')[0]
-        
-    return jsonify({
-        'in_progress': SCAN_STATUS['in_progress'],
-        'progress': SCAN_STATUS['progress'],
-        'current_show': SCAN_STATUS['current_show'],
-        'total_shows': SCAN_STATUS['total_shows'],
-        'processed_shows': SCAN_STATUS['processed_shows'],
-        'status_message': SCAN_STATUS['status_message'],
-        'elapsed_time': elapsed_time,
-        'stop_requested': SCAN_STATUS['stop_requested']
-    })
+    return jsonify(tv_scan_status_payload())
+
+@app.route('/scan_stream')
+def scan_stream():
+    kind = request.args.get('kind', 'tv')
+    if kind not in SCAN_STREAM_CHANNELS:
+        return jsonify({'error': 'kind must be "tv" or "movie".'}), 400
+    ensure_scan_status_publisher(kind)
+    channel = SCAN_STREAM_CHANNELS[kind]
+    q = EVENTS.subscribe(channel)
+    status_payload = tv_scan_status_payload if kind == 'tv' else movie_scan_status_payload
+    return Response(stream_with_context(EVENTS.stream(channel, q, [('status', status_payload())])), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
 
 @app.route('/stop-scan')
 def stop_scan():
-    global SCAN_STATUS
-    if not SCAN_STATUS['in_progress']:
-        return jsonify({'error': 'No scan is in progress.'}), 400
-    
-    SCAN_STATUS['stop_requested'] = True
+    with SCAN_STATUS_LOCK:
+        if not SCAN_STATUS['in_progress']:
+            return jsonify({'error': 'No scan is in progress.'}), 400
+        SCAN_STATUS['stop_requested'] = True
     return jsonify({'success': True})
 
+@app.route('/rescan/show', methods=['POST'])
+def rescan_show_route():
+    data = request.get_json() or {}
+    title = data.get('title')
+    tmdb_id = data.get('tmdb_id')
+    if not title and not tmdb_id:
+        return jsonify({'error': 'title or tmdb_id is required'}), 400
+    try:
+        show = rescan_show(title=title, tmdb_id=tmdb_id)
+    except Exception as e:
+        app.logger.error(f"Error rescanning show {title or tmdb_id}: {e}", exc_info=True)
+        return jsonify({'error': 'Could not rescan show.'}), 500
+    if show is None:
+        return jsonify({'error': 'Show not found in Plex.'}), 404
+    return jsonify({'success': True, 'show': {'title': show['title'], 'status': show['status'], 'series_status': show['series_status']}})
+
+@app.route('/rescan/collection', methods=['POST'])
+def rescan_collection_route():
+    data = request.get_json() or {}
+    tmdb_id = data.get('tmdb_id')
+    if not tmdb_id:
+        return jsonify({'error': 'tmdb_id is required'}), 400
+    try:
+        changed = rescan_collection(tmdb_id)
+    except Exception as e:
+        app.logger.error(f"Error rescanning collection {tmdb_id}: {e}", exc_info=True)
+        return jsonify({'error': 'Could not rescan collection.'}), 500
+    if changed is None:
+        return jsonify({'error': 'Collection not found on TMDb.'}), 404
+    return jsonify({'success': True, 'changed': changed})
+
+@app.route('/plex/webhook', methods=['POST'])
+def plex_webhook():
+    token = CONFIG['plex'].get('webhook_token')
+    if token and request.args.get('token') != token:
+        return jsonify({'error': 'Invalid token.'}), 403
+    # Plex posts multipart/form-data with the event JSON in the 'payload' field
+    try:
+        payload = json.loads(request.form.get('payload') or request.get_data(as_text=True) or '{}')
+    except ValueError:
+        return jsonify({'error': 'Invalid payload.'}), 400
+    queued = handle_library_event(payload.get('event'), payload.get('Metadata') or {})
+    return jsonify({'success': True, 'queued': queued})
+
 @app.route('/show/<title>')
+@cached_response
 def show_details(title):
     title = unquote(title)
     conn = get_db_connection()
-    show_row = conn.execute('SELECT * FROM tv_shows WHERE title = ?', (title,)).fetchone()
-    
-    if show_row:
-        show = dict(show_row)
-        show['genres'] = json.loads(show['genres']) if show['genres'] else []
-        show['networks'] = json.loads(show['networks']) if show['networks'] else []
-    else:
-        show = None
-
-    seasons = {}
+    show = load_show(conn, title)
     if show:
-        db_seasons = conn.execute('SELECT * FROM seasons WHERE tv_show_id = ? ORDER BY season_number', (show['id'],)).fetchall()
-        for s in db_seasons:
-            seasons[s['season_number']] = {
-                'name': s['name'],
-                'overview': s['overview'],
-                'poster_path': s['poster_path'],
-                'air_date': s['air_date'],
-                'episodes': {}
-            }
-            db_episodes = conn.execute('SELECT * FROM episodes WHERE season_id = ? ORDER BY episode_number', (s['id'],)).fetchall()
-            for ep in db_episodes:
-                seasons[s['season_number']]['episodes'][ep['episode_number']] = dict(ep)
-
+        etag = show_etag(show, 'html')
+        if request.if_none_match.contains(etag):
+            conn.close()
+            return not_modified(etag)
+    seasons = load_show_seasons(conn, show['id']) if show else {}
     conn.close()
-    
-    missing_episodes_count = 0
-    future_episodes_count = 0
-    now = datetime.now()
-
-    if seasons:
-        for season_num, season in seasons.items():
-            for episode_num, episode in season['episodes'].items():
-                if not episode['exists_in_plex']:
-                    try:
-                        air_date = datetime.strptime(episode['air_date'], '%Y-%m-%d')
-                        if air_date < now:
-                            missing_episodes_count += 1
-                        else:
-                            future_episodes_count += 1
-                    except (ValueError, TypeError):
-                        missing_episodes_count += 1
-
-
-    return render_template('show_details.html', title=title, show=show, seasons=seasons, missing_episodes_count=missing_episodes_count, future_episodes_count=future_episodes_count, now=now)
+
+    # Counted by the scan; see scan_show
+    missing_episodes_count = show['missing_count'] if show else 0
+    future_episodes_count = show['future_count'] if show else 0
+    today = datetime.now().strftime('%Y-%m-%d')
+
+    response = app.make_response(render_template('show_details.html', title=title, show=show, seasons=seasons, missing_episodes_count=missing_episodes_count, future_episodes_count=future_episodes_count, today=today))
+    if show:
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+    return response
 
 @app.route('/ignore/<title>')
 def ignore(title):
-    title = unquote(title)
-    ignored = get_ignored_shows()
-    
-    if title not in ignored:
-        ignored.append(title)
-        save_ignored_shows(ignored)
-            
+    IGNORED_SHOWS.ignore([unquote(title)])
     return jsonify({'success': True})
 
 @app.route('/unignore/<title>')
 def unignore(title):
-    title = unquote(title)
-    ignored = get_ignored_shows()
-    
-    if title in ignored:
-        ignored.remove(title)
-        save_ignored_shows(ignored)
-            
+    IGNORED_SHOWS.unignore([unquote(title)])
     return redirect(url_for('ignored_shows'))
 
+def request_titles():
+    titles = (request.get_json(silent=True) or {}).get('titles')
+    if not isinstance(titles, list) or not all(isinstance(title, str) and title for title in titles):
+        return None
+    return titles
+
+@app.route('/ignore', methods=['POST'])
+def ignore_shows():
+    titles = request_titles()
+    if titles is None:
+        return jsonify({'error': 'titles must be a list of show titles'}), 400
+    return jsonify({'success': True, 'ignored': IGNORED_SHOWS.ignore(titles)})
+
+@app.route('/unignore', methods=['POST'])
+def unignore_shows():
+    titles = request_titles()
+    if titles is None:
+        return jsonify({'error': 'titles must be a list of show titles'}), 400
+    return jsonify({'success': True, 'unignored': IGNORED_SHOWS.unignore(titles)})
+
 @app.route('/ignored')
+@cached_response
 def ignored_shows():
-    ignored = get_ignored_shows()
-    return render_template('ignored.html', ignored=ignored)
+    return render_template('ignored.html', ignored=IGNORED_SHOWS.entries())
 
 @app.route('/movies')
+@cached_response
 def movies():
+    # Three set-based queries grouped in Python instead of two queries per collection
     conn = get_db_connection()
-    collections_from_db = get_all_collections()
-    
+    collections_from_db = conn.execute('SELECT * FROM collections').fetchall()
+    movie_rows = conn.execute('SELECT * FROM movies').fetchall()
+    missing_rows = conn.execute('SELECT * FROM missing_movies').fetchall()
+    conn.close()
+
+    owned_by_collection = {}
+    owned_by_tmdb_id = {}
+    for row in movie_rows:
+        movie = dict(row)
+        movie['owned'] = True
+        owned_by_tmdb_id.setdefault(movie['tmdb_id'], []).append(movie)
+        if movie['collection_tmdb_id']:
+            owned_by_collection.setdefault(movie['collection_tmdb_id'], []).append(movie)
+
+    missing_by_collection = {}
+    for row in missing_rows:
+        movie = dict(row)
+        movie['owned'] = False
+        missing_by_collection.setdefault(movie['collection_id'], []).append(movie)
+
     collections_with_movies = []
     for coll in collections_from_db:
         collection_tmdb_id = coll['tmdb_id']
-        
-        # Get missing movies
-        missing_movies_rows = get_missing_movies_by_collection_id(coll['id'])
-        missing_movies = [dict(m) for m in missing_movies_rows]
-        for m in missing_movies:
-            m['owned'] = False
+        missing_movies = missing_by_collection.get(coll['id'], [])
 
         # Get owned movies
         if collection_tmdb_id.startswith('movie_'):
             # Single movie collection
-            movie_tmdb_id = collection_tmdb_id[6:]
-            owned_movies_rows = conn.execute('SELECT * FROM movies WHERE tmdb_id = ?', (movie_tmdb_id,)).fetchall()
+            owned_movies = owned_by_tmdb_id.get(collection_tmdb_id[6:], [])
         else:
-            owned_movies_rows = conn.execute('SELECT * FROM movies WHERE collection_tmdb_id = ?', (collection_tmdb_id,)).fetchall()
-        
-        owned_movies = [dict(m) for m in owned_movies_rows]
-        for m in owned_movies:
-            m['owned'] = True
+            owned_movies = owned_by_collection.get(collection_tmdb_id, [])
             
         all_movies = sorted(owned_movies + missing_movies, key=lambda x: x.get('release_date') or '1900-01-01')
         has_missing_movies = len(missing_movies) > 0
@@ -982,47 +2716,237 @@ def movies():
                 'has_missing_movies': has_missing_movies
             })
             
-    conn.close()
     return render_template('movies.html', collections=collections_with_movies)
 
+# === LIBRARY API ===
+@app.route('/api/shows')
+@cached_response
+def api_shows():
+    try:
+        limit, sort_expr, descending, cursor = parse_page_args(request.args, SHOW_SORTS, 'title')
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    conditions = [NOT_IGNORED_SHOW]
+    params = []
+    status = request.args.get('status')
+    if status == 'Unknown':
+        conditions.append("(status IS NULL OR status NOT IN ('Complete', 'Incomplete'))")
+    elif status:
+        conditions.append('status = ?')
+        params.append(status)
+    if request.args.get('series_status'):
+        conditions.append('series_status = ?')
+        params.append(request.args['series_status'])
+    if request.args.get('genre'):
+        conditions.append('id IN (SELECT tv_show_id FROM show_genres WHERE genre = ?)')
+        params.append(request.args['genre'])
+    if request.args.get('network'):
+        conditions.append('id IN (SELECT tv_show_id FROM show_networks WHERE network = ?)')
+        params.append(request.args['network'])
+
+    conn = get_db_connection()
+    try:
+        rows, next_cursor = keyset_page(conn, 'tv_shows', """
+            id, title, tmdb_id, poster_url, overview, first_air_date, status, series_status,
+            number_of_seasons, number_of_episodes, genres, vote_average, networks, last_updated, missing_count, future_count
+        """, sort_expr, descending, conditions, params, cursor, limit)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    finally:
+        conn.close()
+
+    shows = []
+    for row in rows:
+        show = dict(row)
+        del show['sort_key']
+        show['genres'] = json.loads(show['genres'] or '[]')
+        show['networks'] = json.loads(show['networks'] or '[]')
+        shows.append(show)
+    return jsonify({'shows': shows, 'next_cursor': next_cursor})
+
+@app.route('/api/shows/details')
+@cached_response
+def api_show_details():
+    title = request.args.get('title')
+    if not title:
+        return jsonify({'error': 'title is required'}), 400
+    conn = get_db_connection()
+    show = load_show(conn, title)
+    if not show:
+        conn.close()
+        return jsonify({'error': 'Show not found.'}), 404
+    etag = show_etag(show, 'json')
+    if request.if_none_match.contains(etag):
+        conn.close()
+        return not_modified(etag)
+    seasons = load_show_seasons(conn, show['id'])
+    conn.close()
+
+    show['seasons'] = [dict(season, season_number=season_number, episodes=list(season['episodes'].values()))
+                       for season_number, season in seasons.items()]
+    response = jsonify(show)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+@app.route('/api/shows/summary')
+@cached_response
+def api_shows_summary():
+    conn = get_db_connection()
+    counts = get_show_counts(conn)
+    series_statuses = conn.execute(f"""
+        SELECT series_status, COUNT(*) AS count FROM tv_shows WHERE {NOT_IGNORED_SHOW}
+        GROUP BY series_status ORDER BY count DESC
+    """).fetchall()
+    genres = conn.execute(f"""
+        SELECT genre, COUNT(*) AS count FROM show_genres
+        WHERE tv_show_id IN (SELECT id FROM tv_shows WHERE {NOT_IGNORED_SHOW})
+        GROUP BY genre ORDER BY count DESC, genre
+    """).fetchall()
+    networks = conn.execute(f"""
+        SELECT network, COUNT(*) AS count FROM show_networks
+        WHERE tv_show_id IN (SELECT id FROM tv_shows WHERE {NOT_IGNORED_SHOW})
+        GROUP BY network ORDER BY count DESC, network
+    """).fetchall()
+    conn.close()
+
+    return jsonify({
+        'counts': counts,
+        'series_statuses': {row['series_status'] or 'Unknown': row['count'] for row in series_statuses},
+        'genres': {row['genre']: row['count'] for row in genres},
+        'networks': {row['network']: row['count'] for row in networks}
+    })
+
+@app.route('/api/movies')
+@cached_response
+def api_movies():
+    try:
+        limit, sort_expr, descending, cursor = parse_page_args(request.args, MOVIE_SORTS, 'title')
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    conditions = []
+    params = []
+    if request.args.get('collection'):
+        conditions.append('collection_tmdb_id = ?')
+        params.append(request.args['collection'])
+    if request.args.get('studio'):
+        conditions.append('studio = ?')
+        params.append(request.args['studio'])
+
+    conn = get_db_connection()
+    try:
+        rows, next_cursor = keyset_page(conn, 'movies', 'id, title, tmdb_id, poster_url, overview, release_date, studio, collection_tmdb_id, last_updated',
+                                        sort_expr, descending, conditions, params, cursor, limit)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    finally:
+        conn.close()
+
+    movies = []
+    for row in rows:
+        movie = dict(row)
+        del movie['sort_key']
+        movies.append(movie)
+    return jsonify({'movies': movies, 'next_cursor': next_cursor})
+
+@app.route('/api/collections')
+@cached_response
+def api_collections():
+    try:
+        limit, sort_expr, descending, cursor = parse_page_args(request.args, {'name': 'name'}, 'name')
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    conditions = []
+    has_missing = request.args.get('has_missing')
+    if has_missing in ('1', 'true'):
+        conditions.append('EXISTS (SELECT 1 FROM missing_movies WHERE collection_id = collections.id)')
+    elif has_missing in ('0', 'false'):
+        conditions.append('NOT EXISTS (SELECT 1 FROM missing_movies WHERE collection_id = collections.id)')
+
+    conn = get_db_connection()
+    try:
+        rows, next_cursor = keyset_page(conn, 'collections', 'id, name, tmdb_id, poster_url',
+                                        sort_expr, descending, conditions, [], cursor, limit)
+        # Movies for just this page, two queries however many collections it holds
+        collection_ids = [row['id'] for row in rows]
+        collection_tmdb_ids = [row['tmdb_id'] for row in rows]
+        single_movie_ids = [tmdb_id[6:] for tmdb_id in collection_tmdb_ids if tmdb_id.startswith('movie_')]
+        owned_rows = conn.execute(f"""
+            SELECT title, tmdb_id, poster_url, release_date, collection_tmdb_id FROM movies
+            WHERE collection_tmdb_id IN ({', '.join('?' * len(collection_tmdb_ids)) or 'NULL'})
+               OR tmdb_id IN ({', '.join('?' * len(single_movie_ids)) or 'NULL'})
+        """, collection_tmdb_ids + single_movie_ids).fetchall()
+        missing_rows = conn.execute(f"""
+            SELECT collection_id, title, tmdb_id, poster_url, release_date FROM missing_movies
+            WHERE collection_id IN ({', '.join('?' * len(collection_ids)) or 'NULL'})
+        """, collection_ids).fetchall()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    finally:
+        conn.close()
+
+    owned_by_collection = {}
+    owned_by_tmdb_id = {}
+    for row in owned_rows:
+        movie = {'title': row['title'], 'tmdb_id': row['tmdb_id'], 'poster_url': row['poster_url'], 'release_date': row['release_date'], 'owned': True}
+        owned_by_tmdb_id.setdefault(row['tmdb_id'], []).append(movie)
+        if row['collection_tmdb_id']:
+            owned_by_collection.setdefault(row['collection_tmdb_id'], []).append(movie)
+    missing_by_collection = {}
+    for row in missing_rows:
+        movie = {'title': row['title'], 'tmdb_id': row['tmdb_id'], 'poster_url': row['poster_url'], 'release_date': row['release_date'], 'owned': False}
+        missing_by_collection.setdefault(row['collection_id'], []).append(movie)
+
+    collections = []
+    for row in rows:
+        if row['tmdb_id'].startswith('movie_'):
+            owned_movies = owned_by_tmdb_id.get(row['tmdb_id'][6:], [])
+        else:
+            owned_movies = owned_by_collection.get(row['tmdb_id'], [])
+        missing_movies = missing_by_collection.get(row['id'], [])
+        collections.append({
+            'id': row['id'],
+            'name': row['name'],
+            'tmdb_id': row['tmdb_id'],
+            'poster_url': row['poster_url'],
+            'has_missing_movies': len(missing_movies) > 0,
+            'movies': sorted(owned_movies + missing_movies, key=lambda x: x.get('release_date') or '1900-01-01')
+        })
+    return jsonify({'collections': collections, 'next_cursor': next_cursor})
+
 @app.route('/scan_movies')
 def scan_movies():
-    global MOVIE_SCAN_STATUS
-    if MOVIE_SCAN_STATUS['in_progress']:
-        return jsonify({'error': 'A movie scan is already in progress.'}), 400
-    
-    movie_scan_thread = threading.Thread(target=run_movie_scan_thread)
-    movie_scan_thread.start()
-    return jsonify({'success': True})
+    # Queued behind a running movie scan rather than rejected
+    job_id, coalesced = SCAN_JOBS.submit('movie', 'full', 'manual')
+    return jsonify({'success': True, 'job_id': job_id, 'queued': get_movie_scan_status()['in_progress'], 'coalesced': coalesced})
 
 @app.route('/movie_scan_status')
 def movie_scan_status():
-    global MOVIE_SCAN_STATUS
-    elapsed_time = None
-    if MOVIE_SCAN_STATUS['start_time']:
-        elapsed = datetime.now() - MOVIE_SCAN_STATUS['start_time']
-        elapsed_time = str(elapsed).split('.')[0]
-        
-    return jsonify({
-        'in_progress': MOVIE_SCAN_STATUS['in_progress'],
-        'progress': MOVIE_SCAN_STATUS['progress'],
-        'current_collection': MOVIE_SCAN_STATUS['current_collection'],
-        'total_collections': MOVIE_SCAN_STATUS['total_collections'],
-        'processed_collections': MOVIE_SCAN_STATUS['processed_collections'],
-        'status_message': MOVIE_SCAN_STATUS['status_message'],
-        'elapsed_time': elapsed_time,
-        'stop_requested': MOVIE_SCAN_STATUS['stop_requested']
-    })
+    return jsonify(movie_scan_status_payload())
 
 @app.route('/stop_movie_scan')
 def stop_movie_scan():
-    global MOVIE_SCAN_STATUS
-    if not MOVIE_SCAN_STATUS['in_progress']:
-        return jsonify({'error': 'No movie scan is in progress.'}), 400
-    
-    MOVIE_SCAN_STATUS['stop_requested'] = True
+    with MOVIE_SCAN_STATUS_LOCK:
+        if not MOVIE_SCAN_STATUS['in_progress']:
+            return jsonify({'error': 'No movie scan is in progress.'}), 400
+        MOVIE_SCAN_STATUS['stop_requested'] = True
     return jsonify({'success': True})
 
+@app.route('/tmdb_cache_stats')
+def tmdb_cache_stats():
+    return jsonify(TMDB_CACHE.get_stats())
+
+@app.route('/response_cache_stats')
+def response_cache_stats():
+    return jsonify(RESPONSE_CACHE.get_stats())
+
+@app.route('/http_stats')
+def http_stats():
+    return jsonify(HTTP_CLIENTS.get_stats())
+
 @app.route('/search')
 def search():
     query = request.args.get('query', '')
@@ -1034,13 +2958,44 @@ def search_prowlarr_api(query):
     
     url = f"{prowlarr_url}/api/v1/search?query={query}&apikey={prowlarr_api_key}"
     try:
-        response = requests.get(url)
+        response = HTTP_CLIENTS.session('prowlarr').get(url)
         response.raise_for_status()
         return response.json()
     except requests.exceptions.RequestException as e:
         app.logger.error(f"Error searching Prowlarr: {e}")
         return None
 
+# Streaming search: every indexer is queried on its own and given this long to answer
+PROWLARR_INDEXER_TIMEOUT = CONFIG['prowlarr'].get('indexer_timeout_seconds', 15)
+PROWLARR_SEARCH_MAX_WORKERS = 32
+PROWLARR_INDEXERS_TTL = 300
+PROWLARR_INDEXERS = {'url': None, 'indexers': None, 'fetched_at': 0}
+PROWLARR_INDEXERS_LOCK = threading.Lock()
+
+def get_prowlarr_indexers():
+    """Enabled Prowlarr indexers ({'id', 'name'}), cached for a few minutes. Request errors propagate."""
+    prowlarr_url = CONFIG['prowlarr']['url']
+    with PROWLARR_INDEXERS_LOCK:
+        if (PROWLARR_INDEXERS['url'] == prowlarr_url and PROWLARR_INDEXERS['indexers'] is not None
+                and time.monotonic() - PROWLARR_INDEXERS['fetched_at'] < PROWLARR_INDEXERS_TTL):
+            return PROWLARR_INDEXERS['indexers']
+    response = HTTP_CLIENTS.session('prowlarr').get(f"{prowlarr_url}/api/v1/indexer", params={'apikey': CONFIG['prowlarr']['api_key']})
+    response.raise_for_status()
+    indexers = [{'id': indexer['id'], 'name': indexer.get('name') or str(indexer['id'])}
+                for indexer in response.json() if indexer.get('enable', True)]
+    with PROWLARR_INDEXERS_LOCK:
+        PROWLARR_INDEXERS.update(url=prowlarr_url, indexers=indexers, fetched_at=time.monotonic())
+    return indexers
+
+def search_prowlarr_indexer(query, indexer_id):
+    """Search results from a single indexer. Request errors propagate."""
+    response = HTTP_CLIENTS.session('prowlarr').get(
+        f"{CONFIG['prowlarr']['url']}/api/v1/search",
+        params={'query': query, 'indexerIds': indexer_id, 'type': 'search', 'apikey': CONFIG['prowlarr']['api_key']},
+        timeout=PROWLARR_INDEXER_TIMEOUT)
+    response.raise_for_status()
+    return response.json()
+
 def parse_title(title):
     resolution_match = re.search(r'(720p|1080p|2160p)', title, re.IGNORECASE)
     codec_match = re.search(r'(x264|x265|h264|h265)', title, re.IGNORECASE)
@@ -1050,6 +3005,48 @@ def parse_title(title):
     
     return resolution, codec
 
+def process_search_result(result, category_mappings):
+    resolution, codec = parse_title(result['title'])
+    
+    # Category detection based on Prowlarr category ID
+    prowlarr_cat_id = None
+    if 'categories' in result and result['categories']:
+        prowlarr_cat_id = result['categories'][0].get('id')
+
+    category = 'Unknown'
+    for cat_name, cat_ids in category_mappings.items():
+        if prowlarr_cat_id in cat_ids:
+            category = cat_name
+            break
+    
+    if category == 'Unknown':
+        app.logger.warning(f"Unmapped Prowlarr categoryId: {prowlarr_cat_id} for result: {result.get('title')}")
+
+    # Check if item is already in Plex
+    owned = OWNED_TITLES.owns(category, result['title'], result.get('tmdbId'))
+
+    return {
+        'title': result['title'],
+        'seeders': result.get('seeders', 0),
+        'size': result.get('size', 0),
+        'resolution': resolution,
+        'codec': codec,
+        'category': category,
+        'owned': owned,
+        'indexer': result.get('indexer'),
+        'magnetUrl': result.get('magnetUrl'),
+        'downloadUrl': result.get('downloadUrl'),
+        'link': result.get('link'),
+        'guid': result.get('guid')
+    }
+
+def search_result_key(result):
+    """Identity of a release across indexers: its infohash when known, otherwise its guid"""
+    info_hash = result.get('infoHash')
+    if info_hash:
+        return info_hash.lower()
+    return result.get('guid') or result.get('downloadUrl') or result.get('magnetUrl') or result['title']
+
 @app.route('/search_prowlarr')
 def search_prowlarr():
     query = request.args.get('query')
@@ -1060,50 +3057,8 @@ def search_prowlarr():
     if results is None:
         return jsonify({'error': 'Failed to fetch results from Prowlarr'}), 500
 
-    # Check if item is already in Plex
-    plex = PlexServer(CONFIG['plex']['url'], CONFIG['plex']['token'])
-    plex_movies = {m.title.lower() for m in plex.library.section(CONFIG['plex']['movie_library_section']).all()}
-    plex_shows = {s.title.lower() for s in plex.library.section(CONFIG['plex']['library_section']).all()}
-
     prowlarr_cat_mappings = CONFIG.get('prowlarr', {}).get('category_mappings', {})
-
-    processed_results = []
-    for result in results:
-        resolution, codec = parse_title(result['title'])
-        
-        # Category detection based on Prowlarr category ID
-        prowlarr_cat_id = None
-        if 'categories' in result and result['categories']:
-            prowlarr_cat_id = result['categories'][0].get('id')
-
-        category = 'Unknown'
-        for cat_name, cat_ids in prowlarr_cat_mappings.items():
-            if prowlarr_cat_id in cat_ids:
-                category = cat_name
-                break
-        
-        if category == 'Unknown':
-            app.logger.warning(f"Unmapped Prowlarr categoryId: {prowlarr_cat_id} for result: {result.get('title')}")
-
-        owned = False
-        if category == 'movies' and result['title'].lower() in plex_movies:
-            owned = True
-        elif category == 'tv' and result['title'].lower() in plex_shows:
-            owned = True
-
-        processed_results.append({
-            'title': result['title'],
-            'seeders': result.get('seeders', 0),
-            'size': result.get('size', 0),
-            'resolution': resolution,
-            'codec': codec,
-            'category': category,
-            'owned': owned,
-            'magnetUrl': result.get('magnetUrl'),
-            'downloadUrl': result.get('downloadUrl'),
-            'link': result.get('link'),
-            'guid': result.get('guid')
-        })
+    processed_results = [process_search_result(result, prowlarr_cat_mappings) for result in results]
     
     # Filter and sort results
     min_seeders = CONFIG['download_client']['min_seeders']
@@ -1112,6 +3067,100 @@ def search_prowlarr():
     
     return jsonify(sorted_results)
 
+def ndjson_line(data):
+    return json.dumps(data) + '\n'
+
+def stream_prowlarr_search(query):
+    """NDJSON lines for a search fanned out over the indexers, one results line per indexer as it answers.
+
+    Lines are {"type": "start", "indexers": [...]}, then per indexer
+    {"type": "results", ...} or {"type": "error", ...} (including timeouts),
+    then {"type": "done", "total": n}. A release found by several indexers
+    is only sent the first time.
+    """
+    prowlarr_cat_mappings = CONFIG.get('prowlarr', {}).get('category_mappings', {})
+    min_seeders = CONFIG['download_client']['min_seeders']
+    seen = set()
+    total = 0
+
+    def new_results(results):
+        processed = []
+        for result in results:
+            key = search_result_key(result)
+            if key in seen:
+                continue
+            seen.add(key)
+            item = process_search_result(result, prowlarr_cat_mappings)
+            if item['seeders'] >= min_seeders:
+                processed.append(item)
+        return sorted(processed, key=lambda x: x['seeders'], reverse=True)
+
+    try:
+        indexers = get_prowlarr_indexers()
+    except (requests.exceptions.RequestException, ValueError) as e:
+        app.logger.warning(f"Could not list Prowlarr indexers, searching all at once: {e}")
+        indexers = None
+    if not indexers:
+        # Nothing to fan out over, fall back to one search across every indexer
+        yield ndjson_line({'type': 'start', 'indexers': []})
+        results = search_prowlarr_api(query)
+        if results is None:
+            yield ndjson_line({'type': 'error', 'indexer': None, 'error': 'Failed to fetch results from Prowlarr'})
+        else:
+            batch = new_results(results)
+            total += len(batch)
+            yield ndjson_line({'type': 'results', 'indexer': None, 'results': batch})
+        yield ndjson_line({'type': 'done', 'total': total})
+        return
+
+    yield ndjson_line({'type': 'start', 'indexers': [indexer['name'] for indexer in indexers]})
+    # Each indexer's deadline runs from when its request starts, so indexers still queued behind
+    # a full pool aren't timed out before they were even asked
+    started = {}
+
+    def search_indexer(indexer):
+        started[indexer['id']] = time.monotonic()
+        return search_prowlarr_indexer(query, indexer['id'])
+
+    executor = ThreadPoolExecutor(max_workers=min(len(indexers), PROWLARR_SEARCH_MAX_WORKERS), thread_name_prefix='prowlarr-search')
+    futures = {executor.submit(search_indexer, indexer): indexer for indexer in indexers}
+    pending = set(futures)
+    try:
+        while pending:
+            deadlines = [started[futures[future]['id']] + PROWLARR_INDEXER_TIMEOUT for future in pending if futures[future]['id'] in started]
+            timeout = max(0, min(deadlines) - time.monotonic()) if deadlines else PROWLARR_INDEXER_TIMEOUT
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.discard(future)
+                indexer = futures[future]
+                try:
+                    batch = new_results(future.result())
+                except Exception as e:
+                    app.logger.warning(f"Prowlarr indexer {indexer['name']} failed: {e}")
+                    yield ndjson_line({'type': 'error', 'indexer': indexer['name'], 'error': 'Search failed'})
+                    continue
+                total += len(batch)
+                yield ndjson_line({'type': 'results', 'indexer': indexer['name'], 'results': batch})
+            now = time.monotonic()
+            for future in [future for future in pending
+                           if not future.done() and now - started.get(futures[future]['id'], now) >= PROWLARR_INDEXER_TIMEOUT]:
+                pending.discard(future)
+                indexer = futures[future]
+                app.logger.warning(f"Prowlarr indexer {indexer['name']} did not answer within {PROWLARR_INDEXER_TIMEOUT}s")
+                yield ndjson_line({'type': 'error', 'indexer': indexer['name'], 'error': 'Timed out'})
+    finally:
+        # Stragglers finish in the background and their results are dropped
+        executor.shutdown(wait=False, cancel_futures=True)
+    yield ndjson_line({'type': 'done', 'total': total})
+
+@app.route('/search_prowlarr_stream')
+def search_prowlarr_stream():
+    query = request.args.get('query')
+    if not query:
+        return jsonify({'error': 'Query parameter is required'}), 400
+    return Response(stream_prowlarr_search(query), mimetype='application/x-ndjson',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 @app.route('/downloads')
 def downloads():
     return render_template('downloads.html')
@@ -1119,32 +3168,26 @@ def downloads():
 @app.route('/downloads_status')
 def downloads_status():
     try:
-        qbt_client = Client(
-            host=CONFIG['qbittorrent']['host'],
-            port=CONFIG['qbittorrent']['port'],
-            username=CONFIG['qbittorrent']['username'],
-            password=CONFIG['qbittorrent']['password']
-        )
-        qbt_client.auth_log_in()
-        torrents = qbt_client.torrents_info()
-        qbt_client.auth_log_out()
-        
-        downloads = []
-        for torrent in torrents:
-            downloads.append({
-                'name': torrent.name,
-                'size': torrent.size,
-                'progress': torrent.progress,
-                'state': torrent.state,
-                'dlspeed': torrent.dlspeed,
-                'upspeed': torrent.upspeed,
-                'eta': torrent.eta
-            })
+        # Served from the poller's snapshot while it is fresh
+        downloads = list(downloads_snapshot(max_age=DOWNLOADS_POLL_INTERVAL).values())
         return jsonify(downloads)
     except Exception as e:
         app.logger.error(f"Error fetching qBittorrent status: {e}")
         return jsonify({'error': 'Could not connect to qBittorrent.'}), 500
 
+@app.route('/downloads_stream')
+def downloads_stream():
+    ensure_downloads_poller()
+    # Subscribe before taking the snapshot so no delta falls in between
+    q = EVENTS.subscribe(DOWNLOADS_CHANNEL)
+    try:
+        initial = [('snapshot', downloads_snapshot(max_age=DOWNLOADS_POLL_INTERVAL))]
+    except Exception as e:
+        app.logger.error(f"Error fetching qBittorrent status: {e}")
+        initial = [('error', {'error': 'Could not connect to qBittorrent.'})]
+    return Response(stream_with_context(EVENTS.stream(DOWNLOADS_CHANNEL, q, initial)), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 @app.route('/download', methods=['POST'])
 def download():
     data = request.get_json()
@@ -1155,14 +3198,8 @@ def download():
         return jsonify({'error': 'Link is required'}), 400
 
     try:
-        qbt_client = Client(
-            host=CONFIG['qbittorrent']['host'],
-            port=CONFIG['qbittorrent']['port'],
-            username=CONFIG['qbittorrent']['username'],
-            password=CONFIG['qbittorrent']['password']
-        )
-        qbt_client.auth_log_in()
-        
+        qbt_client = get_qbittorrent()
+
         qbt_category = None
         if category == 'movies':
             qbt_category = CONFIG['qbittorrent']['category_mappings'].get('movies')
@@ -1170,25 +3207,23 @@ def download():
             qbt_category = CONFIG['qbittorrent']['category_mappings'].get('tv')
 
         if link.startswith('magnet:'):
-            qbt_client.torrents_add(urls=link, category=qbt_category)
+            qbt_client.call('torrents_add', urls=link, category=qbt_category)
         else:
-            response = requests.get(link, allow_redirects=False)
+            response = HTTP_CLIENTS.session('torrent').get(link, allow_redirects=False)
             if response.status_code in [301, 302, 307, 308] and 'Location' in response.headers:
                 redirect_url = response.headers['Location']
                 if redirect_url.startswith('magnet:'):
-                    qbt_client.torrents_add(urls=redirect_url, category=qbt_category)
+                    qbt_client.call('torrents_add', urls=redirect_url, category=qbt_category)
                 else:
-                    final_response = requests.get(redirect_url)
+                    final_response = HTTP_CLIENTS.session('torrent').get(redirect_url)
                     final_response.raise_for_status()
                     torrent_content = final_response.content
-                    qbt_client.torrents_add(torrent_files=torrent_content, category=qbt_category)
+                    qbt_client.call('torrents_add', torrent_files=torrent_content, category=qbt_category)
             else:
                 response.raise_for_status()
                 torrent_content = response.content
-                qbt_client.torrents_add(torrent_files=torrent_content, category=qbt_category)
-            
-        qbt_client.auth_log_out()
-        
+                qbt_client.call('torrents_add', torrent_files=torrent_content, category=qbt_category)
+
         return jsonify({'success': True})
     except Exception as e:
         app.logger.error(f"Error adding download to qBittorrent: {e}")
@@ -1243,6 +3278,7 @@ def save_settings():
         json.dump(CONFIG, config_file, indent=2)
         
     update_scheduled_jobs() # Reload jobs
+    DATA_GENERATION.bump()
         
     return redirect(url_for('settings'))
 
@@ -1256,7 +3292,7 @@ def test_prowlarr_connection():
         return jsonify({'success': False, 'error': 'URL and API Key are required.'})
         
     try:
-        response = requests.get(f"{url}/api/v1/health?apikey={api_key}")
+        response = HTTP_CLIENTS.session('prowlarr').get(f"{url}/api/v1/health?apikey={api_key}")
         response.raise_for_status()
         return jsonify({'success': True})
     except requests.exceptions.RequestException as e:
@@ -1274,7 +3310,7 @@ def test_qbittorrent_connection():
         return jsonify({'success': False, 'error': 'Host and Port are required.'})
 
     try:
-        client = Client(host=host, port=port, username=username, password=password)
+        client = Client(host=host, port=port, username=username, password=password, REQUESTS_ARGS={'timeout': HTTP_CLIENTS.timeout('qbittorrent')})
         client.auth_log_in()
         client.auth_log_out()
         return jsonify({'success': True})
@@ -1284,4 +3320,7 @@ def test_qbittorrent_connection():
 if __name__ == '__main__':
     update_scheduled_jobs()
     scheduler.start()
+    SCAN_JOBS.resume_interrupted()
+    ensure_downloads_poller()
+    ensure_plex_alert_listener()
     app.run(host=CONFIG['app']['host'], port=CONFIG['app']['port'], debug=CONFIG['app']['debug'])
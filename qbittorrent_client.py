@@ -0,0 +1,84 @@
+import threading
+import time
+from contextlib import nullcontext
+
+from qbittorrentapi import Client, Forbidden403Error, Unauthorized401Error
+
+
+class QBittorrent:
+    """Long-lived, thread-safe qBittorrent Web API client.
+
+    Logs in on first use and again only when qBittorrent rejects the session
+    cookie, instead of a login/logout pair around every call. Torrent status
+    is kept in memory and advanced with the incremental sync/maindata
+    endpoint, so each poll only transfers the fields that changed. Every
+    applied delta is handed to on_sync, whichever thread ran the sync, so
+    no caller can consume a delta that others never see.
+    """
+
+    def __init__(self, host, port, username, password, timeout=None, timer=None, on_sync=None):
+        self.client = Client(host=host, port=port, username=username, password=password,
+                             REQUESTS_ARGS={'timeout': timeout} if timeout else None)
+        self.timer = timer or (lambda: nullcontext())
+        self.on_sync = on_sync
+        self._auth_lock = threading.Lock()
+        self._logged_in = False
+        self._sync_lock = threading.Lock()
+        self.rid = 0
+        self.torrents = {}
+        self.synced_at = None
+        self._completed = []
+
+    def _login(self, force=False):
+        with self._auth_lock:
+            if force or not self._logged_in:
+                self.client.auth_log_in()
+                self._logged_in = True
+
+    def call(self, method, *args, **kwargs):
+        """Call a qbittorrentapi Client method by name, logging in again once if the session expired"""
+        self._login()
+        try:
+            with self.timer():
+                return getattr(self.client, method)(*args, **kwargs)
+        except (Forbidden403Error, Unauthorized401Error):
+            self._login(force=True)
+            with self.timer():
+                return getattr(self.client, method)(*args, **kwargs)
+
+    def sync(self):
+        """Apply the next sync/maindata delta; returns ({hash: changed fields}, [removed hashes])"""
+        with self._sync_lock:
+            data = self.call('sync_maindata', rid=self.rid)
+            changed = {torrent_hash: dict(fields) for torrent_hash, fields in (data.get('torrents') or {}).items()}
+            removed = list(data.get('torrents_removed') or [])
+            # Only torrents we already saw downloading count as completed, not everything in the first full update
+            completed = [torrent_hash for torrent_hash, fields in changed.items()
+                         if fields.get('progress') == 1 and self.torrents.get(torrent_hash, {}).get('progress', 1) < 1]
+            if data.get('full_update'):
+                removed = [torrent_hash for torrent_hash in self.torrents if torrent_hash not in changed]
+                self.torrents = {}
+            for torrent_hash, fields in changed.items():
+                self.torrents.setdefault(torrent_hash, {}).update(fields)
+            for torrent_hash in removed:
+                self.torrents.pop(torrent_hash, None)
+            self._completed.extend(dict(self.torrents[torrent_hash], hash=torrent_hash) for torrent_hash in completed)
+            self.rid = data.get('rid', self.rid)
+            self.synced_at = time.monotonic()
+            # Still under the lock, so deltas reach on_sync in the order they were applied
+            if self.on_sync and (changed or removed):
+                self.on_sync(changed, removed)
+            return changed, removed
+
+    def pop_completed(self):
+        """Torrents that finished downloading since the last call, whichever caller's sync noticed it"""
+        with self._sync_lock:
+            completed, self._completed = self._completed, []
+            return completed
+
+    def get_torrents(self, max_age=0):
+        """Current state of every torrent; only syncs when the snapshot is older than max_age seconds"""
+        if self.synced_at is None or time.monotonic() - self.synced_at >= max_age:
+            self.sync()
+        with self._sync_lock:
+            return {torrent_hash: dict(fields) for torrent_hash, fields in self.torrents.items()}
@@ -0,0 +1,102 @@
+import gzip
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+
+# Bodies smaller than this aren't worth compressing
+GZIP_MIN_SIZE = 1024
+
+
+class DataGeneration:
+    """Token that changes whenever the data behind the pages may have changed.
+
+    SQLite's data_version, read on a connection of our own that never writes,
+    moves on every commit made through any other connection (scans, webhooks,
+    other processes), so no write path has to remember to bump anything.
+    State kept outside the database (config.json) bumps the local counter
+    instead.
+    """
+
+    def __init__(self, path):
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._local = 0
+
+    def bump(self):
+        with self._lock:
+            self._local += 1
+
+    def current(self):
+        with self._lock:
+            data_version = self._conn.execute('PRAGMA data_version').fetchone()[0]
+            return f'{data_version}.{self._local}'
+
+
+class CachedResponse:
+    def __init__(self, body, content_type, etag):
+        self.body = body
+        self.content_type = content_type
+        self.etag = etag
+        # Compressed once when stored, so cache hits never compress
+        self.gzipped = gzip.compress(body, compresslevel=6) if len(body) >= GZIP_MIN_SIZE else None
+        self.size = len(body) + (len(self.gzipped) if self.gzipped else 0)
+
+
+class ResponseCache:
+    """Size-bounded in-memory LRU of rendered responses.
+
+    Keys include the data generation, so entries for stale data are never
+    hit again and simply age out.
+    """
+
+    def __init__(self, max_entries=256, max_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.total_bytes = 0
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return entry
+
+    def put(self, key, body, content_type, etag=None):
+        """Store a response body; without an etag a strong one is derived from the body"""
+        entry = CachedResponse(body, content_type, etag or body_etag(body))
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.total_bytes -= old.size
+            self._entries[key] = entry
+            self.total_bytes += entry.size
+            self.stats['stores'] += 1
+            self._evict()
+        return entry
+
+    def _evict(self):
+        while self._entries and (len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes):
+            _, entry = self._entries.popitem(last=False)
+            self.total_bytes -= entry.size
+            self.stats['evictions'] += 1
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats['entries'] = len(self._entries)
+        stats['size_bytes'] = self.total_bytes
+        stats['max_bytes'] = self.max_bytes
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+
+
+def body_etag(body):
+    return hashlib.sha1(body).hexdigest()
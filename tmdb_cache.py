@@ -0,0 +1,133 @@
+import sqlite3
+import os
+import json
+import time
+import threading
+
+CACHE_PATH = os.path.join(os.path.dirname(__file__), 'data', 'tmdb_cache.db')
+
+# Only bump last_access on a hit when it is older than this, so cache hits don't turn into writes
+ACCESS_RESOLUTION = 3600
+
+
+class TMDbCache:
+    """Size-bounded SQLite cache of TMDb JSON responses with ETag/Last-Modified validators"""
+
+    def __init__(self, path=CACHE_PATH, max_bytes=256 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'revalidated': 0, 'stores': 0, 'evictions': 0}
+
+        conn = self._conn()
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS responses (
+                cache_key TEXT PRIMARY KEY,
+                body TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                size INTEGER NOT NULL
+            )
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses (last_access)')
+        conn.commit()
+        self.total_bytes = conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+
+    def _conn(self):
+        # One connection per thread; sqlite3 connections can't be shared across threads
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def record(self, counter, amount=1):
+        with self._lock:
+            self.stats[counter] += amount
+
+    def get(self, key):
+        """Return the cached entry for key (fresh or stale), or None"""
+        conn = self._conn()
+        row = conn.execute('SELECT * FROM responses WHERE cache_key = ?', (key,)).fetchone()
+        if not row:
+            return None
+        now = time.time()
+        if now - row['last_access'] > ACCESS_RESOLUTION:
+            conn.execute('UPDATE responses SET last_access = ? WHERE cache_key = ?', (now, key))
+            conn.commit()
+        return {
+            'data': json.loads(row['body']),
+            'etag': row['etag'],
+            'last_modified': row['last_modified'],
+            'fetched_at': row['fetched_at'],
+            'expires_at': row['expires_at'],
+            'fresh': row['expires_at'] > now
+        }
+
+    def put(self, key, data, ttl, etag=None, last_modified=None):
+        body = json.dumps(data)
+        now = time.time()
+        with self._lock:
+            conn = self._conn()
+            old = conn.execute('SELECT size FROM responses WHERE cache_key = ?', (key,)).fetchone()
+            conn.execute("""
+                INSERT OR REPLACE INTO responses (cache_key, body, etag, last_modified, fetched_at, expires_at, last_access, size)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, (key, body, etag, last_modified, now, now + ttl, now, len(body)))
+            conn.commit()
+            self.total_bytes += len(body) - (old['size'] if old else 0)
+            self.stats['stores'] += 1
+            if self.total_bytes > self.max_bytes:
+                self._evict(conn)
+
+    def refresh(self, key, ttl):
+        """Extend the lifetime of an entry after the origin answered 304 Not Modified"""
+        now = time.time()
+        conn = self._conn()
+        conn.execute('UPDATE responses SET fetched_at = ?, expires_at = ?, last_access = ? WHERE cache_key = ?', (now, now + ttl, now, key))
+        conn.commit()
+
+    def invalidate(self, *prefixes):
+        """Expire endpoints and everything below them (e.g. 'tv/1399' also covers its seasons), in one transaction"""
+        # Keys under a prefix sort between prefix + '/' and prefix + '0' (or '?' and '@' for query strings),
+        # so each prefix is a range lookup on the primary key rather than a LIKE over the whole table
+        conn = self._conn()
+        conn.executemany("""
+            UPDATE responses SET expires_at = 0
+            WHERE cache_key = ? OR (cache_key >= ? AND cache_key < ?) OR (cache_key >= ? AND cache_key < ?)
+        """, [(prefix, prefix + '/', prefix + '0', prefix + '?', prefix + '@') for prefix in prefixes])
+        conn.commit()
+
+    def _evict(self, conn):
+        # Drop least recently used entries until we're back under 90% of the budget
+        target = self.max_bytes * 0.9
+        while self.total_bytes > target:
+            rows = conn.execute('SELECT cache_key, size FROM responses ORDER BY last_access LIMIT 100').fetchall()
+            if not rows:
+                self.total_bytes = 0
+                break
+            for row in rows:
+                conn.execute('DELETE FROM responses WHERE cache_key = ?', (row['cache_key'],))
+                self.total_bytes -= row['size']
+                self.stats['evictions'] += 1
+                if self.total_bytes <= target:
+                    break
+            conn.commit()
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+        conn = self._conn()
+        stats['entries'] = conn.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+        stats['size_bytes'] = self.total_bytes
+        stats['max_bytes'] = self.max_bytes
+        lookups = stats['hits'] + stats['misses'] + stats['revalidated']
+        stats['hit_rate'] = (stats['hits'] + stats['revalidated']) / lookups if lookups else 0.0
+        return stats